@@ -28,10 +28,25 @@ class Settings(BaseSettings):
     temp_dir: Path = Path("/tmp/deepseek_ocr")
     output_dir: Path = Path("/tmp/deepseek_ocr/outputs")
     cleanup_temp_files: bool = True
+    temp_ttl_seconds: int = 3600  # Age after which stray temp files are removed
+    temp_gc_interval: float = 60.0  # seconds between temp file cleanup passes
+    result_cache_size: int = 128  # Cached OCR responses keyed by upload hash
+    persist_result_cache: bool = True  # Also store cached responses on disk
+    prewarm_cache_bytes: int = 256 * 1024 * 1024  # Persisted results loaded at startup
+    result_cache_disk_bytes: int = 1024 * 1024 * 1024  # Cap on persisted results
+    concurrency: int = 1  # Concurrent inference threads (model uses all cores)
+    page_workers: int = 0  # PDF page worker processes, each with its own model (0 = off)
+    max_inflight: int = 2  # Admitted OCR requests before returning 429
+    max_inflight_enhanced: int = 1  # Admitted enhanced PDF requests
+    admission_timeout: float = 0.1  # seconds to wait for a free slot
+    max_queued_jobs: int = 16  # Pending async enhanced PDF jobs
+    max_job_results: int = 256  # Async job statuses/results kept for polling
     
     # Model settings
     model_path: Optional[str] = None  # Will use default from inference module
     device: str = "cpu"
+    warmup: bool = True  # Run a dummy inference at startup
+    warmup_timeout: float = 60.0  # seconds before a slow warmup is logged
     
     # CORS settings
     cors_origins: list = ["*"]
@@ -1,22 +1,36 @@
 """FastAPI application for DeepSeek OCR service."""
 
+import asyncio
+import functools
+import hashlib
+import json
 import logging
+import os
 import shutil
 import tempfile
 import time
+import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
+import aiofiles
+from cachetools import LRUCache
 from fastapi import FastAPI, File, UploadFile, HTTPException, status, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
 
 from inference import (
     process_image_with_metrics,
     process_pdf_with_metrics,
     process_pdf_enhanced,
+    process_pdf_parallel,
 )
+from inference.image import OCR_PROMPT
+from inference.model_loader import MODEL_PATH
+from inference.pdf import create_page_pool
 
 from .config import settings
 from .models import (
@@ -25,6 +39,7 @@ from .models import (
     ImageOCRResponse,
     PDFOCRResponse,
     PDFEnhancedResponse,
+    JobStatusResponse,
     ErrorResponse,
 )
 
@@ -41,10 +56,31 @@ class AppState:
     """Application state container."""
     model_loaded: bool = False
     startup_time: Optional[float] = None
+    inflight_jobs: int = 0
 
 
 app_state = AppState()
 
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+MULTIPART_OVERHEAD = 64 * 1024
+ADMISSION_POLL_INTERVAL = 0.01  # seconds between checks for a free slot
+RESULT_CACHE_DIR = settings.output_dir / ".cache"
+RESULT_CACHE_INDEX = RESULT_CACHE_DIR / "index.json"
+# Pruning frees the persisted cache down to this share of its size cap, so
+# a full cache is not rescanned on every store
+RESULT_CACHE_PRUNE_TARGET = 0.9
+
+# Minimal valid DocumentStructure payload for enhanced error responses
+EMPTY_DOC_STRUCTURE = {
+    "document_metadata": {
+        "filename": "",
+        "num_pages": 0,
+        "total_elements": 0,
+        "element_counts": {},
+    },
+    "pages": [],
+}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -53,34 +89,304 @@ async def lifespan(app: FastAPI):
     logger.info("Starting DeepSeek OCR API service...")
     app_state.startup_time = time.time()
     
-    # Warmup - load model by processing a dummy request
+    # Load the model once and share the handles with every request.
+    # Failing here aborts startup instead of serving requests that would
+    # each trigger a cold model load.
     try:
         logger.info("Loading model... This may take 2-5 minutes on first start...")
         from inference.model_loader import load_model_and_tokenizer
         
-        # Actually load the model during startup
         tokenizer, model = load_model_and_tokenizer()
-        
-        app_state.model_loaded = True
-        elapsed = time.time() - app_state.startup_time
-        logger.info(f"Model loaded successfully in {elapsed:.2f}s")
     except Exception as e:
-        logger.error(f"Model warmup failed: {e}")
+        logger.error(f"Model loading failed: {e}")
         app_state.model_loaded = False
+        raise
+    
+    app.state.tokenizer = tokenizer
+    app.state.model = model
+    # Inference is blocking and uses all intra-op threads, so it runs on a
+    # small dedicated pool to keep the event loop free for other requests
+    app.state.ocr_executor = ThreadPoolExecutor(
+        max_workers=settings.concurrency, thread_name_prefix="ocr"
+    )
+    # Admission budgets; enhanced PDF jobs hold overlay bitmaps in memory
+    # so they get a separate, smaller budget
+    app.state.job_sem = asyncio.Semaphore(settings.max_inflight)
+    app.state.enhanced_job_sem = asyncio.Semaphore(settings.max_inflight_enhanced)
+    app.state.result_cache = LRUCache(maxsize=settings.result_cache_size)
+    # Per-key hit statistics, persisted across restarts to pre-warm the cache
+    app.state.cache_stats = {}
+    app.state.result_cache_bytes = 0
+    app.state.config_fingerprint = await asyncio.to_thread(config_fingerprint)
+    if settings.persist_result_cache:
+        warmed = await asyncio.to_thread(prewarm_result_cache)
+        if warmed:
+            logger.info(f"Pre-loaded {warmed} cached results from: {RESULT_CACHE_DIR}")
+        pruned = await asyncio.to_thread(prune_result_cache)
+        if pruned:
+            logger.info(f"Removed {pruned} stale cached results from: {RESULT_CACHE_DIR}")
+    # Queue and results for asynchronous enhanced PDF jobs
+    app.state.job_queue = asyncio.Queue(maxsize=settings.max_queued_jobs)
+    app.state.jobs = LRUCache(maxsize=settings.max_job_results)
+    # Optional multi-process page pool; each worker holds its own model
+    app.state.page_pool = (
+        create_page_pool(settings.page_workers) if settings.page_workers > 0 else None
+    )
+    app_state.model_loaded = True
+    elapsed = time.time() - app_state.startup_time
+    logger.info(f"Model loaded successfully in {elapsed:.2f}s")
+    
+    if settings.warmup:
+        await warmup_pipeline(tokenizer, model)
+    
+    # Periodically remove stale uploads, including any whose request
+    # never reached its cleanup step
+    gc_task = asyncio.create_task(temp_gc_loop()) if settings.cleanup_temp_files else None
+    job_worker_task = asyncio.create_task(enhanced_job_worker())
     
     yield
     
     # Shutdown
     logger.info("Shutting down DeepSeek OCR API service...")
+    app.state.ocr_executor.shutdown(wait=False, cancel_futures=True)
+    if app.state.page_pool is not None:
+        app.state.page_pool.shutdown(wait=False, cancel_futures=True)
+    
+    job_worker_task.cancel()
+    if gc_task is not None:
+        gc_task.cancel()
+    
+    if settings.persist_result_cache:
+        save_cache_index()
     
     # Cleanup temp files if configured
     if settings.cleanup_temp_files:
+        temp_paths = list_temp_entries()
+        with ThreadPoolExecutor() as executor:
+            executor.map(remove_temp_path, temp_paths)
+        logger.info(f"Cleaned up {len(temp_paths)} temp entries in: {settings.temp_dir}")
+
+
+def _is_protected(path: Path) -> bool:
+    """Whether path is, or contains, the output directory or result cache."""
+    path = path.resolve()
+    for protected in (settings.output_dir.resolve(), RESULT_CACHE_DIR.resolve()):
+        if path == protected or path in protected.parents:
+            return True
+    return False
+
+
+def list_temp_entries() -> List[Path]:
+    """
+    List uploads and scratch directories directly under temp_dir.
+    
+    The output directory and result cache are never included, even when
+    they live inside temp_dir.
+    """
+    try:
+        with os.scandir(settings.temp_dir) as entries:
+            paths = [
+                Path(entry.path) for entry in entries
+                if entry.is_file(follow_symlinks=False) or entry.is_dir(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
+        return []
+    return [path for path in paths if not _is_protected(path)]
+
+
+def unlink_quietly(path: Path) -> None:
+    """Remove a file, logging instead of raising on failure."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to cleanup temp file {path}: {e}")
+
+
+def remove_temp_path(path: Path) -> None:
+    """Remove a temp file or scratch directory, logging instead of raising on failure."""
+    if path.is_dir() and not path.is_symlink():
+        def log_error(func, failed_path, exc_info):
+            if not isinstance(exc_info[1], FileNotFoundError):
+                logger.warning(f"Failed to cleanup temp path {failed_path}: {exc_info[1]}")
+        shutil.rmtree(path, onerror=log_error)
+    else:
+        unlink_quietly(path)
+
+
+def latest_mtime(path: Path) -> float:
+    """Most recent modification time of path or, for a directory, anything under it."""
+    latest = path.stat().st_mtime
+    if path.is_dir() and not path.is_symlink():
+        for root, dirs, files in os.walk(path):
+            for name in dirs + files:
+                try:
+                    latest = max(latest, os.stat(os.path.join(root, name), follow_symlinks=False).st_mtime)
+                except FileNotFoundError:
+                    continue
+    return latest
+
+
+def remove_expired_temp_files() -> int:
+    """
+    Remove temp entries older than temp_ttl_seconds and return the count.
+    
+    Scratch directories count as expired only once nothing inside them has
+    been modified for temp_ttl_seconds, so running jobs keep theirs.
+    """
+    cutoff = time.time() - settings.temp_ttl_seconds
+    expired = []
+    for path in list_temp_entries():
+        try:
+            if latest_mtime(path) < cutoff:
+                expired.append(path)
+        except FileNotFoundError:
+            continue
+    for path in expired:
+        remove_temp_path(path)
+    return len(expired)
+
+
+async def temp_gc_loop() -> None:
+    """Background task removing expired temp files every gc interval."""
+    while True:
+        await asyncio.sleep(settings.temp_gc_interval)
         try:
-            if settings.temp_dir.exists():
-                shutil.rmtree(settings.temp_dir)
-                logger.info(f"Cleaned up temp directory: {settings.temp_dir}")
+            removed = await asyncio.to_thread(remove_expired_temp_files)
+            if removed:
+                logger.info(f"Removed {removed} expired temp files")
         except Exception as e:
-            logger.error(f"Failed to cleanup temp directory: {e}")
+            logger.error(f"Temp file cleanup failed: {e}")
+
+
+def schedule_temp_cleanup(path: Path) -> None:
+    """Remove a temp file or scratch directory on a worker thread without blocking the request."""
+    asyncio.get_running_loop().run_in_executor(None, remove_temp_path, path)
+
+
+def make_scratch_dir() -> Path:
+    """Create a per-request directory under temp_dir for outputs that are not kept."""
+    return Path(tempfile.mkdtemp(prefix="scratch_", dir=settings.temp_dir))
+
+
+async def run_ocr(func, *args, **kwargs):
+    """Run a blocking inference call on the OCR thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        app.state.ocr_executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+async def warmup_pipeline(tokenizer, model) -> None:
+    """Run one dummy inference so the first request hits warm code paths."""
+    from PIL import Image
+    
+    logger.info("Warming up OCR pipeline...")
+    warmup_start = time.monotonic()
+    try:
+        with tempfile.TemporaryDirectory(dir=settings.temp_dir) as warmup_dir:
+            image_path = Path(warmup_dir) / "warmup.png"
+            Image.new("RGB", (64, 64), "white").save(image_path)
+            
+            # The model only returns output when saving results, so give
+            # the dummy run a scratch output directory
+            warmup = asyncio.ensure_future(run_ocr(
+                process_image_with_metrics,
+                str(image_path),
+                output_dir=str(Path(warmup_dir) / "output"),
+                tokenizer=tokenizer,
+                model=model,
+            ))
+            # Inference on the executor cannot be cancelled, so a slow
+            # warmup is only reported. Awaiting it keeps the scratch
+            # directory alive and the executor free once startup completes
+            done, _ = await asyncio.wait({warmup}, timeout=settings.warmup_timeout)
+            if not done:
+                logger.warning(
+                    f"Warmup still running after {settings.warmup_timeout:g}s, waiting for it"
+                )
+            await warmup
+        logger.info(f"Warmup completed in {time.monotonic() - warmup_start:.2f}s")
+    except Exception as e:
+        logger.warning(f"Warmup inference failed: {e!r}")
+
+
+class ContentSizeLimitMiddleware:
+    """Reject requests whose declared Content-Length exceeds the limit."""
+    
+    def __init__(self, app, max_content_size: int):
+        self.app = app
+        self.max_content_size = max_content_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length" and value.isdigit():
+                    if int(value) > self.max_content_size:
+                        response = ORJSONResponse(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            content={"detail": "Request body too large"},
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
+async def acquire_slot(semaphore: asyncio.Semaphore) -> bool:
+    """
+    Take a slot from an admission budget, waiting up to admission_timeout.
+    
+    Polls instead of awaiting acquire() under wait_for, which can leak a
+    permit when the timeout races a release on Python 3.10. A free slot is
+    taken without suspending, so the acquire below cannot be interrupted.
+    """
+    deadline = time.monotonic() + settings.admission_timeout
+    while semaphore.locked():
+        if time.monotonic() >= deadline:
+            return False
+        await asyncio.sleep(ADMISSION_POLL_INTERVAL)
+    await semaphore.acquire()
+    return True
+
+
+class AdmissionMiddleware:
+    """
+    Admit OCR requests against their in-flight budget before the body is read.
+    
+    budgets maps a POST path to the app.state attribute holding its
+    semaphore. Requests over budget get 429 without their upload being
+    received. Until the model is loaded requests pass through, so the
+    endpoints can answer 503.
+    """
+    
+    def __init__(self, app, budgets: Dict[str, str]):
+        self.app = app
+        self.budgets = budgets
+    
+    async def __call__(self, scope, receive, send):
+        budget = None
+        if scope["type"] == "http" and scope["method"] == "POST" and app_state.model_loaded:
+            budget = self.budgets.get(scope["path"])
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+        
+        semaphore = getattr(scope["app"].state, budget)
+        if not await acquire_slot(semaphore):
+            response = ORJSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": "Too many OCR requests in flight, retry later"},
+            )
+            await response(scope, receive, send)
+            return
+        app_state.inflight_jobs += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            app_state.inflight_jobs -= 1
+            semaphore.release()
 
 
 # Create FastAPI app
@@ -89,6 +395,7 @@ app = FastAPI(
     version=settings.app_version,
     description="CPU-based OCR service using DeepSeek OCR model",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -100,6 +407,232 @@ app.add_middleware(
     allow_headers=settings.cors_headers,
 )
 
+# Admit synchronous OCR requests against their budgets before the upload
+# is read
+app.add_middleware(
+    AdmissionMiddleware,
+    budgets={
+        f"{settings.api_prefix}/ocr/image": "job_sem",
+        f"{settings.api_prefix}/ocr/pdf": "job_sem",
+        f"{settings.api_prefix}/ocr/pdf/enhanced": "enhanced_job_sem",
+    },
+)
+
+# Reject oversized uploads before the body is read. The margin leaves room
+# for multipart framing around the file itself.
+app.add_middleware(
+    ContentSizeLimitMiddleware,
+    max_content_size=settings.max_upload_size + MULTIPART_OVERHEAD,
+)
+
+
+def require_ready() -> None:
+    """Reject requests with 503 until the model has been loaded."""
+    if not app_state.model_loaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Model is not loaded yet"
+        )
+
+
+def config_fingerprint() -> str:
+    """
+    Hash the model and inference settings that determine OCR output.
+    
+    Prefixed to result cache keys so that results persisted under another
+    checkpoint, dtype, compile backend, prompt or app version are never
+    served.
+    """
+    try:
+        model_mtime = max((path.stat().st_mtime_ns for path in MODEL_PATH.iterdir()), default=0)
+    except OSError:
+        model_mtime = 0
+    parts = [
+        settings.app_version,
+        str(MODEL_PATH),
+        str(model_mtime),
+        os.environ.get("DEEPSEEK_OCR_DTYPE", "").strip().lower(),
+        os.environ.get("DEEPSEEK_OCR_COMPILE", "").strip().lower(),
+        OCR_PROMPT,
+    ]
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=8).hexdigest()
+
+
+def result_cache_key(kind: str, content_hash: str, *params) -> str:
+    """Build a result cache key from the config fingerprint, upload hash and request parameters."""
+    return "_".join([app.state.config_fingerprint, kind, content_hash, *map(str, params)])
+
+
+def record_cache_hit(key: str, size: Optional[int] = None) -> None:
+    """Update the hit statistics used to pick entries to pre-load."""
+    stats = app.state.cache_stats.setdefault(key, {"timestamp": 0.0, "size": 0, "hit_count": 0})
+    stats["timestamp"] = time.time()
+    if size is not None:
+        stats["size"] = size
+    else:
+        stats["hit_count"] += 1
+
+
+async def get_cached_result(key: str) -> Optional[dict]:
+    """Look up a cached response payload in memory, then on disk."""
+    cached = app.state.result_cache.get(key)
+    if cached is None and settings.persist_result_cache:
+        cache_path = RESULT_CACHE_DIR / f"{key}.json"
+        try:
+            data = await asyncio.to_thread(cache_path.read_bytes)
+            cached = json.loads(data)
+        except (OSError, ValueError):
+            return None
+        app.state.result_cache[key] = cached
+        record_cache_hit(key, len(data))
+    if cached is not None:
+        record_cache_hit(key)
+    return cached
+
+
+async def store_cached_result(key: str, response: BaseModel) -> None:
+    """Cache a successful response payload, minus its processing time."""
+    payload = response.model_dump(mode="json", exclude={"processing_time"})
+    app.state.result_cache[key] = payload
+    if settings.persist_result_cache:
+        try:
+            RESULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_path = RESULT_CACHE_DIR / f"{key}.json"
+            data = json.dumps(payload)
+            await asyncio.to_thread(cache_path.write_text, data, encoding="utf-8")
+            record_cache_hit(key, len(data))
+            app.state.result_cache_bytes += len(data)
+            if app.state.result_cache_bytes > settings.result_cache_disk_bytes:
+                await asyncio.to_thread(prune_result_cache)
+        except OSError as e:
+            logger.warning(f"Failed to persist cached result: {e}")
+
+
+def save_cache_index() -> None:
+    """Write the cache hit statistics next to the persisted results."""
+    try:
+        RESULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        RESULT_CACHE_INDEX.write_text(json.dumps(app.state.cache_stats), encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"Failed to save result cache index: {e}")
+
+
+def prune_result_cache() -> int:
+    """
+    Delete persisted results until they fit in result_cache_disk_bytes.
+    
+    Results stored under another config fingerprint can never be served
+    and are always removed. The rest are evicted least recently used first,
+    down to RESULT_CACHE_PRUNE_TARGET of the cap. Files missing from the
+    hit statistics, e.g. after a crash, are aged by their mtime.
+    
+    Returns:
+        Number of results removed
+    """
+    prefix = f"{app.state.config_fingerprint}_"
+    stats = app.state.cache_stats
+    entries = []
+    removed = 0
+    for path in RESULT_CACHE_DIR.glob("*.json"):
+        if path == RESULT_CACHE_INDEX:
+            continue
+        key = path.stem
+        if not key.startswith(prefix):
+            unlink_quietly(path)
+            stats.pop(key, None)
+            removed += 1
+            continue
+        entry = stats.get(key)
+        if entry is None:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entry = stats[key] = {"timestamp": st.st_mtime, "size": st.st_size, "hit_count": 0}
+        entries.append((entry["timestamp"], key, entry["size"]))
+    
+    total = sum(size for _, _, size in entries)
+    if total > settings.result_cache_disk_bytes:
+        target = settings.result_cache_disk_bytes * RESULT_CACHE_PRUNE_TARGET
+        for _, key, size in sorted(entries):
+            if total <= target:
+                break
+            unlink_quietly(RESULT_CACHE_DIR / f"{key}.json")
+            stats.pop(key, None)
+            total -= size
+            removed += 1
+    
+    app.state.result_cache_bytes = total
+    return removed
+
+
+def prewarm_result_cache() -> int:
+    """
+    Load the most valuable persisted results back into memory.
+    
+    Entries are ranked by hits per byte and loaded until the cache is full
+    or prewarm_cache_bytes is used up. Entries stored under another config
+    fingerprint are skipped.
+    
+    Returns:
+        Number of results loaded
+    """
+    try:
+        stats = json.loads(RESULT_CACHE_INDEX.read_bytes())
+    except (OSError, ValueError):
+        return 0
+    
+    ranked = sorted(
+        stats.items(),
+        key=lambda item: item[1]["hit_count"] / max(item[1]["size"], 1),
+        reverse=True,
+    )
+    budget = settings.prewarm_cache_bytes
+    loaded = 0
+    prefix = f"{app.state.config_fingerprint}_"
+    for key, entry in ranked:
+        if not key.startswith(prefix):
+            continue
+        if loaded >= settings.result_cache_size or entry["size"] > budget:
+            continue
+        try:
+            data = (RESULT_CACHE_DIR / f"{key}.json").read_bytes()
+            app.state.result_cache[key] = json.loads(data)
+        except (OSError, ValueError):
+            continue
+        budget -= len(data)
+        loaded += 1
+    
+    # Keep statistics only for results still on disk
+    app.state.cache_stats = {
+        key: entry for key, entry in stats.items()
+        if (RESULT_CACHE_DIR / f"{key}.json").exists()
+    }
+    return loaded
+
+
+def list_output_files(output_dir: Path) -> List[str]:
+    """
+    List files under a request's output directory, relative to output_dir.
+    
+    Walks the tree with os.scandir, whose directory entries carry the file
+    type, so no per-file stat() call is needed.
+    """
+    output_files = []
+    stack = [str(output_dir)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    output_files.append(os.path.relpath(entry.path, settings.output_dir))
+    return output_files
+
 
 def validate_file_extension(filename: str, allowed_extensions: set) -> None:
     """Validate file extension."""
@@ -111,21 +644,36 @@ def validate_file_extension(filename: str, allowed_extensions: set) -> None:
         )
 
 
-def validate_file_size(file: UploadFile) -> None:
-    """Validate file size."""
-    # Note: This is a simplified check. For production, consider streaming validation.
-    pass  # Size will be checked during upload
-
-
-async def save_upload_file(upload_file: UploadFile, destination: Path) -> Path:
-    """Save uploaded file to destination."""
+async def save_upload_file(upload_file: UploadFile, destination: Path) -> str:
+    """
+    Stream uploaded file to destination in fixed-size chunks.
+    
+    Raises 413 as soon as the upload exceeds max_upload_size, removing the
+    partially written file.
+    
+    Returns:
+        Hex digest of the uploaded content, used as the result cache key
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    total_size = 0
     try:
         destination.parent.mkdir(parents=True, exist_ok=True)
-        with destination.open("wb") as buffer:
-            shutil.copyfileobj(upload_file.file, buffer)
-        return destination
+        async with aiofiles.open(destination, "wb") as buffer:
+            while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
+                total_size += len(chunk)
+                if total_size > settings.max_upload_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File exceeds maximum upload size of {settings.max_upload_size} bytes"
+                    )
+                digest.update(chunk)
+                await buffer.write(chunk)
+        return digest.hexdigest()
+    except HTTPException:
+        destination.unlink(missing_ok=True)
+        raise
     finally:
-        upload_file.file.close()
+        await upload_file.close()
 
 
 # Health and info endpoints
@@ -138,7 +686,8 @@ async def health_check():
     """Health check endpoint."""
     return HealthResponse(
         status="healthy" if app_state.model_loaded else "starting",
-        version=settings.app_version
+        version=settings.app_version,
+        inflight_jobs=app_state.inflight_jobs,
     )
 
 
@@ -161,7 +710,8 @@ async def model_info():
     f"{settings.api_prefix}/ocr/image",
     response_model=ImageOCRResponse,
     tags=["OCR"],
-    summary="Process an image with OCR"
+    summary="Process an image with OCR",
+    dependencies=[Depends(require_ready)],
 )
 async def process_image_endpoint(
     file: UploadFile = File(..., description="Image file to process"),
@@ -174,8 +724,13 @@ async def process_image_endpoint(
     - **save_output**: Whether to save output files
     
     Returns OCR results in text format with performance metrics.
+    
+    Identical uploads with the same parameters are answered from the
+    result cache. With save_output=True a cache hit returns the
+    output_files written by the request that produced the result and
+    writes nothing new.
     """
-    start_time = time.time()
+    start_time = time.monotonic()
     temp_file = None
     output_dir = None
     
@@ -186,8 +741,16 @@ async def process_image_endpoint(
         validate_file_extension(file.filename, settings.allowed_image_extensions)
         
         # Create temp file
-        temp_file = settings.temp_dir / f"{time.time()}_{file.filename}"
-        await save_upload_file(file, temp_file)
+        # Unique name that also drops any directory part of the client filename
+        temp_file = settings.temp_dir / f"{uuid.uuid4().hex}_{Path(file.filename).name}"
+        content_hash = await save_upload_file(file, temp_file)
+        
+        # Short-circuit identical uploads with the cached result
+        cache_key = result_cache_key("image", content_hash, save_output)
+        cached = await get_cached_result(cache_key)
+        if cached is not None:
+            logger.info(f"Result cache hit for: {file.filename}")
+            return ImageOCRResponse(**cached, processing_time=time.monotonic() - start_time)
         
         logger.info(f"Processing image: {file.filename} (size: {temp_file.stat().st_size} bytes)")
         
@@ -198,20 +761,21 @@ async def process_image_endpoint(
         
         # Process image
         logger.info(f"Starting OCR inference for: {file.filename}")
-        result, metrics = process_image_with_metrics(
+        result, metrics = await run_ocr(
+            process_image_with_metrics,
             str(temp_file),
-            output_dir=str(output_dir) if output_dir else None
+            output_dir=str(output_dir) if output_dir else None,
+            tokenizer=app.state.tokenizer,
+            model=app.state.model,
         )
         logger.info(f"OCR inference completed for: {file.filename} in {metrics.total_time:.2f}s")
         
         # Collect output files
-        output_files = []
-        if output_dir and output_dir.exists():
-            output_files = [str(f.relative_to(settings.output_dir)) for f in output_dir.rglob("*") if f.is_file()]
+        output_files = list_output_files(output_dir) if output_dir else []
         
-        processing_time = time.time() - start_time
+        processing_time = time.monotonic() - start_time
         
-        return ImageOCRResponse(
+        response = ImageOCRResponse(
             success=True,
             text=result,
             processing_time=processing_time,
@@ -219,29 +783,31 @@ async def process_image_endpoint(
             tokens_per_second=metrics.tokens_per_second if metrics else None,
             output_files=output_files if output_files else None
         )
+        await store_cached_result(cache_key, response)
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing image: {str(e)}", exc_info=True)
         return ImageOCRResponse(
             success=False,
             text="",
-            processing_time=time.time() - start_time,
+            processing_time=time.monotonic() - start_time,
             error=str(e)
         )
     finally:
         # Cleanup temp file
-        if temp_file and temp_file.exists() and settings.cleanup_temp_files:
-            try:
-                temp_file.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to cleanup temp file: {e}")
+        if temp_file and settings.cleanup_temp_files:
+            schedule_temp_cleanup(temp_file)
 
 
 @app.post(
     f"{settings.api_prefix}/ocr/pdf",
     response_model=PDFOCRResponse,
     tags=["OCR"],
-    summary="Process a PDF document with OCR"
+    summary="Process a PDF document with OCR",
+    dependencies=[Depends(require_ready)],
 )
 async def process_pdf_endpoint(
     file: UploadFile = File(..., description="PDF file to process"),
@@ -258,42 +824,70 @@ async def process_pdf_endpoint(
     - **save_output**: Whether to save output files
     
     Returns OCR results in text format for all pages.
+    
+    Identical uploads with the same parameters are answered from the
+    result cache. With save_output=True a cache hit returns the
+    output_files written by the request that produced the result and
+    writes nothing new.
     """
-    start_time = time.time()
+    start_time = time.monotonic()
     temp_file = None
     output_dir = None
+    scratch_dir = None
     
     try:
         # Validate file
         validate_file_extension(file.filename, settings.allowed_pdf_extensions)
         
         # Create temp file
-        temp_file = settings.temp_dir / f"{time.time()}_{file.filename}"
-        await save_upload_file(file, temp_file)
+        # Unique name that also drops any directory part of the client filename
+        temp_file = settings.temp_dir / f"{uuid.uuid4().hex}_{Path(file.filename).name}"
+        content_hash = await save_upload_file(file, temp_file)
+        
+        # Short-circuit identical uploads with the cached result
+        cache_key = result_cache_key("pdf", content_hash, start_page, end_page, save_output)
+        cached = await get_cached_result(cache_key)
+        if cached is not None:
+            logger.info(f"Result cache hit for: {file.filename}")
+            return PDFOCRResponse(**cached, processing_time=time.monotonic() - start_time)
         
         logger.info(f"Processing PDF: {file.filename}")
         
-        # Setup output directory
+        # Setup output directory; unsaved runs write to a scratch directory
+        # removed with the upload
         if save_output:
             output_dir = settings.output_dir / f"{temp_file.stem}_{int(time.time())}"
             output_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            scratch_dir = make_scratch_dir()
         
-        # Process PDF
-        result, metrics = process_pdf_with_metrics(
-            str(temp_file),
-            output_dir=str(output_dir) if output_dir else None,
-            start_page=start_page,
-            end_page=end_page,
-        )
+        # Process PDF, spreading pages across the page pool when enabled
+        if app.state.page_pool is not None:
+            result, metrics = await run_ocr(
+                process_pdf_parallel,
+                str(temp_file),
+                output_dir=str(output_dir or scratch_dir),
+                start_page=start_page,
+                end_page=end_page,
+                executor=app.state.page_pool,
+            )
+        else:
+            result, metrics = await run_ocr(
+                process_pdf_with_metrics,
+                str(temp_file),
+                output_dir=str(output_dir or scratch_dir),
+                start_page=start_page,
+                end_page=end_page,
+                tokenizer=app.state.tokenizer,
+                model=app.state.model,
+            )
         
         # Collect output files
-        output_files = []
-        if output_dir and output_dir.exists():
-            output_files = [str(f.relative_to(settings.output_dir)) for f in output_dir.rglob("*") if f.is_file()]
+        output_files = list_output_files(output_dir) if output_dir else []
         
-        processing_time = time.time() - start_time
+        processing_time = time.monotonic() - start_time
         
-        return PDFOCRResponse(
+        response = PDFOCRResponse(
             success=True,
             text=result,
             num_pages=metrics.num_operations if metrics else 0,
@@ -301,31 +895,53 @@ async def process_pdf_endpoint(
             pages_processed=list(range(1, (metrics.num_operations if metrics else 0) + 1)),
             output_files=output_files if output_files else None
         )
+        await store_cached_result(cache_key, response)
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing PDF: {str(e)}", exc_info=True)
         return PDFOCRResponse(
             success=False,
             text="",
             num_pages=0,
-            processing_time=time.time() - start_time,
+            processing_time=time.monotonic() - start_time,
             pages_processed=[],
             error=str(e)
         )
     finally:
-        # Cleanup temp file
-        if temp_file and temp_file.exists() and settings.cleanup_temp_files:
-            try:
-                temp_file.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to cleanup temp file: {e}")
+        # Cleanup temp file and scratch outputs
+        if temp_file and settings.cleanup_temp_files:
+            schedule_temp_cleanup(temp_file)
+        if scratch_dir is not None:
+            schedule_temp_cleanup(scratch_dir)
+
+
+def build_enhanced_response(
+    result: dict, output_dir: Optional[Path], processing_time: float
+) -> PDFEnhancedResponse:
+    """Build a successful enhanced PDF response from process_pdf_enhanced output."""
+    output_files = list_output_files(output_dir) if output_dir else []
+    num_pages = result['structure']['document_metadata']['num_pages']
+    
+    return PDFEnhancedResponse(
+        success=True,
+        text=result['markdown'],
+        structure=result['structure'],
+        num_pages=num_pages,
+        processing_time=processing_time,
+        pages_processed=list(range(1, num_pages + 1)),
+        output_files=output_files if output_files else None
+    )
 
 
 @app.post(
     f"{settings.api_prefix}/ocr/pdf/enhanced",
     response_model=PDFEnhancedResponse,
     tags=["OCR"],
-    summary="Process a PDF document with enhanced extraction"
+    summary="Process a PDF document with enhanced extraction",
+    dependencies=[Depends(require_ready)],
 )
 async def process_pdf_enhanced_endpoint(
     file: UploadFile = File(..., description="PDF file to process"),
@@ -346,83 +962,208 @@ async def process_pdf_enhanced_endpoint(
     - **save_output**: Whether to save output files
     
     Returns OCR results with structured element extraction and metadata.
+    
+    Identical uploads with the same parameters are answered from the
+    result cache. With save_output=True a cache hit returns the
+    output_files written by the request that produced the result and
+    writes nothing new.
     """
-    start_time = time.time()
+    start_time = time.monotonic()
     temp_file = None
     output_dir = None
+    scratch_dir = None
     
     try:
         # Validate file
         validate_file_extension(file.filename, settings.allowed_pdf_extensions)
         
         # Create temp file
-        temp_file = settings.temp_dir / f"{time.time()}_{file.filename}"
-        await save_upload_file(file, temp_file)
+        # Unique name that also drops any directory part of the client filename
+        temp_file = settings.temp_dir / f"{uuid.uuid4().hex}_{Path(file.filename).name}"
+        content_hash = await save_upload_file(file, temp_file)
+        
+        # Short-circuit identical uploads with the cached result
+        cache_key = result_cache_key(
+            "pdf_enhanced", content_hash,
+            start_page, end_page, generate_overlays, save_elements, save_output,
+        )
+        cached = await get_cached_result(cache_key)
+        if cached is not None:
+            logger.info(f"Result cache hit for: {file.filename}")
+            return PDFEnhancedResponse(**cached, processing_time=time.monotonic() - start_time)
         
         logger.info(f"Processing PDF with enhanced extraction: {file.filename}")
         
-        # Setup output directory
+        # Setup output directory; unsaved runs write to a scratch directory
+        # removed with the upload
         if save_output:
             output_dir = settings.output_dir / f"{temp_file.stem}_enhanced_{int(time.time())}"
             output_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            scratch_dir = make_scratch_dir()
         
         # Process PDF with enhanced extraction
-        result = process_pdf_enhanced(
+        result = await run_ocr(
+            process_pdf_enhanced,
             str(temp_file),
-            output_dir=str(output_dir) if output_dir else None,
+            output_dir=str(output_dir or scratch_dir),
             start_page=start_page,
             end_page=end_page,
             generate_overlays=generate_overlays,
             save_elements=save_elements,
+            tokenizer=app.state.tokenizer,
+            model=app.state.model,
+            executor=app.state.page_pool,
+            include_elements=False,
         )
         
-        # Collect output files
-        output_files = []
-        if output_dir and output_dir.exists():
-            output_files = [str(f.relative_to(settings.output_dir)) for f in output_dir.rglob("*") if f.is_file()]
-        
-        processing_time = time.time() - start_time
-        
-        return PDFEnhancedResponse(
-            success=True,
-            text=result['markdown'],
-            structure=result['structure'],
-            num_pages=result['structure']['document_metadata']['num_pages'],
-            processing_time=processing_time,
-            pages_processed=list(range(1, result['structure']['document_metadata']['num_pages'] + 1)),
-            output_files=output_files if output_files else None
-        )
+        response = build_enhanced_response(result, output_dir, time.monotonic() - start_time)
+        await store_cached_result(cache_key, response)
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing PDF with enhanced extraction: {str(e)}", exc_info=True)
         
-        # Return error response with minimal valid structure
-        from .models import DocumentMetadata, DocumentStructure
-        
-        return PDFEnhancedResponse(
-            success=False,
-            text="",
-            structure=DocumentStructure(
-                document_metadata=DocumentMetadata(
-                    filename=file.filename,
-                    num_pages=0,
-                    total_elements=0,
-                    element_counts={}
-                ),
-                pages=[]
-            ),
-            num_pages=0,
-            processing_time=time.time() - start_time,
-            pages_processed=[],
-            error=str(e)
+        # Return error response with minimal valid structure, built as a
+        # plain dict to skip nested model construction on the error path
+        return ORJSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={
+                "success": False,
+                "text": "",
+                "structure": {
+                    **EMPTY_DOC_STRUCTURE,
+                    "document_metadata": {
+                        **EMPTY_DOC_STRUCTURE["document_metadata"],
+                        "filename": file.filename,
+                    },
+                },
+                "num_pages": 0,
+                "processing_time": time.monotonic() - start_time,
+                "pages_processed": [],
+                "output_files": None,
+                "error": str(e),
+            },
         )
     finally:
-        # Cleanup temp file
-        if temp_file and temp_file.exists() and settings.cleanup_temp_files:
-            try:
-                temp_file.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to cleanup temp file: {e}")
+        # Cleanup temp file and scratch outputs
+        if temp_file and settings.cleanup_temp_files:
+            schedule_temp_cleanup(temp_file)
+        if scratch_dir is not None:
+            schedule_temp_cleanup(scratch_dir)
+
+
+async def enhanced_job_worker() -> None:
+    """Background task running queued enhanced PDF jobs one at a time."""
+    while True:
+        job_id, temp_file, output_dir, params = await app.state.job_queue.get()
+        job = app.state.jobs.get(job_id)
+        start_time = time.monotonic()
+        scratch_dir = None
+        try:
+            if job is not None:
+                job.status = "running"
+            if output_dir is None:
+                scratch_dir = make_scratch_dir()
+            result = await run_ocr(
+                process_pdf_enhanced,
+                str(temp_file),
+                output_dir=str(output_dir or scratch_dir),
+                tokenizer=app.state.tokenizer,
+                model=app.state.model,
+                executor=app.state.page_pool,
+                include_elements=False,
+                **params,
+            )
+            if job is not None:
+                job.result = build_enhanced_response(
+                    result, output_dir, time.monotonic() - start_time
+                )
+                job.status = "completed"
+        except Exception as e:
+            logger.error(f"Enhanced PDF job {job_id} failed: {str(e)}", exc_info=True)
+            if job is not None:
+                job.status = "failed"
+                job.error = str(e)
+        finally:
+            if settings.cleanup_temp_files:
+                schedule_temp_cleanup(temp_file)
+            if scratch_dir is not None:
+                schedule_temp_cleanup(scratch_dir)
+            app.state.job_queue.task_done()
+
+
+@app.post(
+    f"{settings.api_prefix}/ocr/pdf/enhanced/async",
+    response_model=JobStatusResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["OCR"],
+    summary="Queue a PDF document for enhanced extraction",
+    dependencies=[Depends(require_ready)],
+)
+async def submit_pdf_enhanced_job(
+    file: UploadFile = File(..., description="PDF file to process"),
+    start_page: Optional[int] = None,
+    end_page: Optional[int] = None,
+    generate_overlays: bool = True,
+    save_elements: bool = True,
+    save_output: bool = True,
+):
+    """
+    Queue a PDF file for enhanced extraction and return immediately.
+    
+    Takes the same parameters as `/ocr/pdf/enhanced`. Poll
+    `/ocr/jobs/{job_id}` for the result.
+    """
+    validate_file_extension(file.filename, settings.allowed_pdf_extensions)
+    
+    job_id = uuid.uuid4().hex
+    temp_file = settings.temp_dir / f"{job_id}_{Path(file.filename).name}"
+    await save_upload_file(file, temp_file)
+    
+    output_dir = None
+    if save_output:
+        output_dir = settings.output_dir / f"{temp_file.stem}_enhanced_{int(time.time())}"
+        output_dir.mkdir(parents=True, exist_ok=True)
+    
+    params = {
+        "start_page": start_page,
+        "end_page": end_page,
+        "generate_overlays": generate_overlays,
+        "save_elements": save_elements,
+    }
+    try:
+        app.state.job_queue.put_nowait((job_id, temp_file, output_dir, params))
+    except asyncio.QueueFull:
+        schedule_temp_cleanup(temp_file)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Job queue is full, retry later"
+        )
+    
+    job = JobStatusResponse(job_id=job_id, status="queued")
+    app.state.jobs[job_id] = job
+    logger.info(f"Queued enhanced PDF job {job_id} for: {file.filename}")
+    return job
+
+
+@app.get(
+    f"{settings.api_prefix}/ocr/jobs/{{job_id}}",
+    response_model=JobStatusResponse,
+    tags=["OCR"],
+    summary="Get the status of a queued OCR job",
+)
+async def get_job_status(job_id: str):
+    """Return the status, and once completed the result, of a queued job."""
+    job = app.state.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found: {job_id}"
+        )
+    return job
 
 
 # Root endpoint
@@ -10,6 +10,7 @@ class HealthResponse(BaseModel):
     status: str = "healthy"
     timestamp: datetime = Field(default_factory=datetime.now)
     version: str
+    inflight_jobs: int = 0
 
 
 class ModelInfo(BaseModel):
@@ -107,6 +108,14 @@ class PDFEnhancedResponse(BaseModel):
     error: Optional[str] = None
 
 
+class JobStatusResponse(BaseModel):
+    """Status of an asynchronous OCR job."""
+    job_id: str
+    status: str  # queued, running, completed, failed
+    result: Optional[PDFEnhancedResponse] = None
+    error: Optional[str] = None
+
+
 class ErrorResponse(BaseModel):
     """Error response model."""
     error: str
@@ -1,6 +1,6 @@
 """Inference package for DeepSeek OCR CPU workflows."""
 
 from .image import process_image, process_image_enhanced, process_image_with_metrics  # noqa: F401
-from .pdf import process_pdf, process_pdf_enhanced, process_pdf_with_metrics  # noqa: F401
+from .pdf import process_pdf, process_pdf_enhanced, process_pdf_with_metrics, process_pdf_parallel  # noqa: F401
 from .pdf_to_images import pdf_to_images  # noqa: F401
-from .performance_metrics import PerformanceMetrics, AggregateMetrics, PerformanceTracker, count_tokens  # noqa: F401
+from .performance_metrics import PerformanceMetrics, AggregateMetrics, PerformanceTracker, count_tokens, count_tokens_batch  # noqa: F401
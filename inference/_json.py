@@ -0,0 +1,34 @@
+"""JSON writers shared by the inference pipeline, using orjson when installed."""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def write_json(path: Path, data) -> None:
+    """Write data as indented JSON."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+
+def write_jsonl(path: Path, rows: Iterable[Dict]) -> None:
+    """Write rows as JSON Lines in one encode pass and one write."""
+    if orjson is not None:
+        data = b''.join(orjson.dumps(row) + b'\n' for row in rows)
+    else:
+        data = ''.join(json.dumps(row) + '\n' for row in rows).encode('utf-8')
+    path.write_bytes(data)
+
+
+def read_json(path: Path):
+    """Read a JSON file."""
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
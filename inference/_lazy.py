@@ -0,0 +1,33 @@
+"""Lazy (PEP 562) exports for inference subpackages."""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable[[], List[str]]]:
+    """
+    Build module __getattr__ and __dir__ hooks for a package's public names.
+    
+    Each name's submodule is imported on first attribute access rather than
+    with the package, and the value is cached on the package afterwards.
+    
+    Args:
+        package: The package's __name__
+        exports: Mapping of public name to the submodule defining it
+    
+    Returns:
+        Tuple of (__getattr__, __dir__) to assign in the package
+    """
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(f".{exports[name]}", package)
+        value = getattr(module, name)
+        setattr(sys.modules[package], name, value)
+        return value
+    
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+    
+    return __getattr__, __dir__
@@ -9,6 +9,7 @@ __version__ = "0.1.0"
 
 from .element_extractor import extract_all_elements, extract_element_content
 from .bbox_processor import (
+    BBox,
     normalize_bbox,
     denormalize_bbox,
     denormalize_bbox_999,
@@ -16,13 +17,23 @@ from .bbox_processor import (
     add_padding,
     calculate_bbox_metrics,
     check_overlap,
+    batch_normalize_bbox,
+    batch_denormalize_bbox,
+    batch_denormalize_bbox_999,
+    batch_filter_boxes_999,
+    batch_add_padding,
+    batch_clip_bbox_to_image,
+    batch_calculate_bbox_metrics,
+    batch_iou,
+    batch_check_overlap,
 )
-from .image_cropper import crop_and_save_element, save_all_elements
+from .image_cropper import crop_and_save_element, save_all_elements, save_all_elements_batched
 from .overlay_generator import generate_type_overlays, generate_type_overlay
 
 __all__ = [
     "extract_all_elements",
     "extract_element_content",
+    "BBox",
     "normalize_bbox",
     "denormalize_bbox",
     "denormalize_bbox_999",
@@ -30,8 +41,18 @@ __all__ = [
     "add_padding",
     "calculate_bbox_metrics",
     "check_overlap",
+    "batch_normalize_bbox",
+    "batch_denormalize_bbox",
+    "batch_denormalize_bbox_999",
+    "batch_filter_boxes_999",
+    "batch_add_padding",
+    "batch_clip_bbox_to_image",
+    "batch_calculate_bbox_metrics",
+    "batch_iou",
+    "batch_check_overlap",
     "crop_and_save_element",
     "save_all_elements",
+    "save_all_elements_batched",
     "generate_type_overlays",
     "generate_type_overlay",
 ]
@@ -0,0 +1,54 @@
+"""
+Numba-compiled IoU kernel.
+
+Compiled counterpart of check_overlap for dense pairwise overlap scans.
+Importing this module requires numba; bbox_processor falls back to the
+NumPy implementation when it is not installed.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+# No fastmath: the same IEEE operations in the same order as batch_iou keep
+# the two implementations bit-identical, so thresholds don't depend on
+# whether numba is installed
+@njit(parallel=True, cache=True)
+def pairwise_iou(boxes: np.ndarray) -> np.ndarray:
+    """
+    Calculate the IoU between every pair of bounding boxes.
+
+    Args:
+        boxes: Contiguous float64 array of shape (N, 4) with columns x1, y1, x2, y2
+
+    Returns:
+        float64 array of shape (N, N) with IoU values in [0,1]
+    """
+    n = boxes.shape[0]
+    iou = np.zeros((n, n), dtype=np.float64)
+
+    for i in prange(n):
+        ax1 = boxes[i, 0]
+        ay1 = boxes[i, 1]
+        ax2 = boxes[i, 2]
+        ay2 = boxes[i, 3]
+        area_a = (ax2 - ax1) * (ay2 - ay1)
+
+        for j in range(n):
+            # Calculate intersection coordinates
+            x1_inter = max(ax1, boxes[j, 0])
+            y1_inter = max(ay1, boxes[j, 1])
+            x2_inter = min(ax2, boxes[j, 2])
+            y2_inter = min(ay2, boxes[j, 3])
+
+            if x1_inter >= x2_inter or y1_inter >= y2_inter:
+                continue
+
+            inter_area = (x2_inter - x1_inter) * (y2_inter - y1_inter)
+            area_b = (boxes[j, 2] - boxes[j, 0]) * (boxes[j, 3] - boxes[j, 1])
+            union_area = area_a + area_b - inter_area
+
+            if union_area > 0:
+                iou[i, j] = inter_area / union_area
+
+    return iou
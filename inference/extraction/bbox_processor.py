@@ -5,14 +5,66 @@ Provides functions for coordinate transformations, validation,
 and geometric operations on bounding boxes.
 """
 
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional, Union
+
+import numpy as np
+
+try:
+    from ._iou_numba import pairwise_iou as _pairwise_iou_numba
+except ImportError:  # numba is optional
+    _pairwise_iou_numba = None
+
+try:
+    from ._filter_numba import filter_boxes_999 as _filter_boxes_999_numba
+except ImportError:
+    _filter_boxes_999_numba = None
+
+
+# Reciprocal of the DeepSeek coordinate range, hoisted out of the per-box math
+_INV_999 = 1.0 / 999.0
+
+
+class BBox(NamedTuple):
+    """Bounding box as an immutable (x1, y1, x2, y2) tuple."""
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    
+    @classmethod
+    def from_dict(cls, bbox: Dict[str, float]) -> 'BBox':
+        """Build a BBox from a dict with keys 'x1', 'y1', 'x2', 'y2'."""
+        return cls(bbox['x1'], bbox['y1'], bbox['x2'], bbox['y2'])
+    
+    def to_dict(self) -> Dict[str, float]:
+        """Return the box as a dict with keys 'x1', 'y1', 'x2', 'y2'."""
+        return {'x1': self.x1, 'y1': self.y1, 'x2': self.x2, 'y2': self.y2}
+
+
+# Functions below accept either a BBox or the dict form used in element
+# metadata, and return the same form they were given
+BBoxLike = Union[BBox, Dict[str, float]]
+
+
+def _unpack(bbox: BBoxLike) -> Tuple[float, float, float, float]:
+    """Return the (x1, y1, x2, y2) coordinates of a BBox or bbox dict."""
+    if isinstance(bbox, tuple):
+        return bbox
+    return bbox['x1'], bbox['y1'], bbox['x2'], bbox['y2']
+
+
+def _pack(like: BBoxLike, x1, y1, x2, y2) -> BBoxLike:
+    """Build a box of the same form as ``like`` from coordinates."""
+    if isinstance(like, tuple):
+        return BBox(x1, y1, x2, y2)
+    return {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2}
 
 
 def normalize_bbox(
-    bbox: Dict[str, float],
+    bbox: BBoxLike,
     image_width: int,
     image_height: int
-) -> Dict[str, float]:
+) -> BBoxLike:
     """
     Convert absolute coordinates to normalized [0,1] range.
     
@@ -24,19 +76,21 @@ def normalize_bbox(
     Returns:
         Normalized bounding box with values in [0,1] range
     """
-    return {
-        'x1': bbox['x1'] / image_width,
-        'y1': bbox['y1'] / image_height,
-        'x2': bbox['x2'] / image_width,
-        'y2': bbox['y2'] / image_height,
-    }
+    x1, y1, x2, y2 = _unpack(bbox)
+    return _pack(
+        bbox,
+        x1 / image_width,
+        y1 / image_height,
+        x2 / image_width,
+        y2 / image_height,
+    )
 
 
 def denormalize_bbox(
-    bbox: Dict[str, float],
+    bbox: BBoxLike,
     image_width: int,
     image_height: int
-) -> Dict[str, int]:
+) -> BBoxLike:
     """
     Convert normalized coordinates to absolute pixels.
     
@@ -51,19 +105,21 @@ def denormalize_bbox(
     Returns:
         Bounding box with absolute pixel coordinates
     """
-    return {
-        'x1': int(bbox['x1'] * image_width),
-        'y1': int(bbox['y1'] * image_height),
-        'x2': int(bbox['x2'] * image_width),
-        'y2': int(bbox['y2'] * image_height),
-    }
+    x1, y1, x2, y2 = _unpack(bbox)
+    return _pack(
+        bbox,
+        int(x1 * image_width),
+        int(y1 * image_height),
+        int(x2 * image_width),
+        int(y2 * image_height),
+    )
 
 
 def denormalize_bbox_999(
-    bbox: Dict[str, float],
+    bbox: BBoxLike,
     image_width: int,
     image_height: int
-) -> Dict[str, int]:
+) -> BBoxLike:
     """
     Convert DeepSeek model coordinates (0-999) to absolute pixels.
     
@@ -75,16 +131,18 @@ def denormalize_bbox_999(
     Returns:
         Bounding box with absolute pixel coordinates
     """
-    return {
-        'x1': int(bbox['x1'] / 999 * image_width),
-        'y1': int(bbox['y1'] / 999 * image_height),
-        'x2': int(bbox['x2'] / 999 * image_width),
-        'y2': int(bbox['y2'] / 999 * image_height),
-    }
+    x1, y1, x2, y2 = _unpack(bbox)
+    return _pack(
+        bbox,
+        int(x1 * image_width * _INV_999),
+        int(y1 * image_height * _INV_999),
+        int(x2 * image_width * _INV_999),
+        int(y2 * image_height * _INV_999),
+    )
 
 
 def validate_bbox(
-    bbox: Dict[str, float],
+    bbox: BBoxLike,
     image_width: int,
     image_height: int,
     allow_out_of_bounds: bool = False
@@ -102,7 +160,7 @@ def validate_bbox(
         True if bbox is valid, False otherwise
     """
     try:
-        x1, y1, x2, y2 = bbox['x1'], bbox['y1'], bbox['x2'], bbox['y2']
+        x1, y1, x2, y2 = _unpack(bbox)
         
         # Check valid ordering
         if x1 >= x2 or y1 >= y2:
@@ -118,16 +176,16 @@ def validate_bbox(
                 return False
         
         return True
-    except (KeyError, TypeError):
+    except (KeyError, TypeError, ValueError):
         return False
 
 
 def add_padding(
-    bbox: Dict[str, int],
+    bbox: BBoxLike,
     padding: int,
     image_width: int,
     image_height: int
-) -> Dict[str, int]:
+) -> BBoxLike:
     """
     Add padding around bounding box, clipping to image bounds.
     
@@ -140,15 +198,17 @@ def add_padding(
     Returns:
         Padded bounding box clipped to image boundaries
     """
-    return {
-        'x1': max(0, bbox['x1'] - padding),
-        'y1': max(0, bbox['y1'] - padding),
-        'x2': min(image_width, bbox['x2'] + padding),
-        'y2': min(image_height, bbox['y2'] + padding),
-    }
+    x1, y1, x2, y2 = _unpack(bbox)
+    return _pack(
+        bbox,
+        max(0, x1 - padding),
+        max(0, y1 - padding),
+        min(image_width, x2 + padding),
+        min(image_height, y2 + padding),
+    )
 
 
-def calculate_bbox_metrics(bbox: Dict[str, float]) -> Dict[str, float]:
+def calculate_bbox_metrics(bbox: BBoxLike) -> Dict[str, float]:
     """
     Calculate width, height, area, and aspect ratio of bounding box.
     
@@ -158,8 +218,9 @@ def calculate_bbox_metrics(bbox: Dict[str, float]) -> Dict[str, float]:
     Returns:
         Dictionary with metrics: width, height, area, aspect_ratio
     """
-    width = bbox['x2'] - bbox['x1']
-    height = bbox['y2'] - bbox['y1']
+    x1, y1, x2, y2 = _unpack(bbox)
+    width = x2 - x1
+    height = y2 - y1
     area = width * height
     aspect_ratio = width / height if height > 0 else 0.0
     
@@ -171,7 +232,7 @@ def calculate_bbox_metrics(bbox: Dict[str, float]) -> Dict[str, float]:
     }
 
 
-def check_overlap(bbox1: Dict[str, float], bbox2: Dict[str, float]) -> float:
+def check_overlap(bbox1: BBoxLike, bbox2: BBoxLike) -> float:
     """
     Calculate IoU (Intersection over Union) between two bounding boxes.
     
@@ -182,11 +243,14 @@ def check_overlap(bbox1: Dict[str, float], bbox2: Dict[str, float]) -> float:
     Returns:
         IoU value in [0,1], where 0 = no overlap, 1 = complete overlap
     """
+    ax1, ay1, ax2, ay2 = _unpack(bbox1)
+    bx1, by1, bx2, by2 = _unpack(bbox2)
+    
     # Calculate intersection coordinates
-    x1_inter = max(bbox1['x1'], bbox2['x1'])
-    y1_inter = max(bbox1['y1'], bbox2['y1'])
-    x2_inter = min(bbox1['x2'], bbox2['x2'])
-    y2_inter = min(bbox1['y2'], bbox2['y2'])
+    x1_inter = max(ax1, bx1)
+    y1_inter = max(ay1, by1)
+    x2_inter = min(ax2, bx2)
+    y2_inter = min(ay2, by2)
     
     # Check if there is an intersection
     if x1_inter >= x2_inter or y1_inter >= y2_inter:
@@ -194,8 +258,8 @@ def check_overlap(bbox1: Dict[str, float], bbox2: Dict[str, float]) -> float:
     
     # Calculate areas
     inter_area = (x2_inter - x1_inter) * (y2_inter - y1_inter)
-    bbox1_area = (bbox1['x2'] - bbox1['x1']) * (bbox1['y2'] - bbox1['y1'])
-    bbox2_area = (bbox2['x2'] - bbox2['x1']) * (bbox2['y2'] - bbox2['y1'])
+    bbox1_area = (ax2 - ax1) * (ay2 - ay1)
+    bbox2_area = (bx2 - bx1) * (by2 - by1)
     union_area = bbox1_area + bbox2_area - inter_area
     
     # Calculate IoU
@@ -205,10 +269,10 @@ def check_overlap(bbox1: Dict[str, float], bbox2: Dict[str, float]) -> float:
 
 
 def clip_bbox_to_image(
-    bbox: Dict[str, int],
+    bbox: BBoxLike,
     image_width: int,
     image_height: int
-) -> Dict[str, int]:
+) -> BBoxLike:
     """
     Clip bounding box to image boundaries.
     
@@ -220,9 +284,318 @@ def clip_bbox_to_image(
     Returns:
         Clipped bounding box
     """
+    x1, y1, x2, y2 = _unpack(bbox)
+    return _pack(
+        bbox,
+        max(0, min(x1, image_width)),
+        max(0, min(y1, image_height)),
+        max(0, min(x2, image_width)),
+        max(0, min(y2, image_height)),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Batch (N, 4) array variants
+#
+# The dict-based helpers above operate on a single box. The batch variants
+# below take an (N, 4) array of x1, y1, x2, y2 rows and apply the same
+# transform to every box in one vectorized operation.
+# ---------------------------------------------------------------------------
+
+
+def _bboxes_to_array(
+    bboxes: List[BBoxLike],
+    dtype: np.dtype = np.float64
+) -> np.ndarray:
+    """
+    Stack bounding box dicts into an (N, 4) array.
+    
+    Args:
+        bboxes: List of BBoxes or bounding box dicts
+        dtype: Array dtype (default: float64)
+    
+    Returns:
+        Array of shape (N, 4) with columns x1, y1, x2, y2
+    """
+    if not bboxes:
+        return np.empty((0, 4), dtype=dtype)
+    if isinstance(bboxes[0], tuple):
+        # BBoxes are plain tuples, so NumPy can stack them directly
+        return np.array(bboxes, dtype=dtype)
+    return np.array([_unpack(b) for b in bboxes], dtype=dtype)
+
+
+def _array_to_bboxes(arr: np.ndarray) -> List[Dict[str, float]]:
+    """
+    Convert an (N, 4) array back to a list of bounding box dicts.
+    
+    Values are converted to native Python numbers so the result is
+    JSON-serializable.
+    
+    Args:
+        arr: Array of shape (N, 4) with columns x1, y1, x2, y2
+    
+    Returns:
+        List of bounding boxes with keys 'x1', 'y1', 'x2', 'y2'
+    """
+    return [
+        {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2}
+        for x1, y1, x2, y2 in np.asarray(arr).reshape(-1, 4).tolist()
+    ]
+
+
+def batch_normalize_bbox(
+    boxes: np.ndarray,
+    image_width: int,
+    image_height: int
+) -> np.ndarray:
+    """
+    Convert absolute coordinates to normalized [0,1] range for N boxes.
+    
+    Args:
+        boxes: Array of shape (N, 4) in absolute pixels
+        image_width: Image width in pixels
+        image_height: Image height in pixels
+    
+    Returns:
+        float32 array of shape (N, 4) with values in [0,1] range
+    """
+    inv_scale = np.array(
+        [1 / image_width, 1 / image_height, 1 / image_width, 1 / image_height],
+        dtype=np.float32,
+    )
+    return np.asarray(boxes, dtype=np.float32) * inv_scale
+
+
+def batch_denormalize_bbox(
+    boxes: np.ndarray,
+    image_width: int,
+    image_height: int
+) -> np.ndarray:
+    """
+    Convert normalized [0,1] coordinates to absolute pixels for N boxes.
+    
+    Args:
+        boxes: Array of shape (N, 4) with normalized coordinates
+        image_width: Image width in pixels
+        image_height: Image height in pixels
+    
+    Returns:
+        int32 array of shape (N, 4) with absolute pixel coordinates
+    """
+    scale = np.array(
+        [image_width, image_height, image_width, image_height],
+        dtype=np.float64,
+    )
+    arr = np.array(boxes, dtype=np.float64)
+    np.multiply(arr, scale, out=arr)
+    return arr.astype(np.int32, copy=False)
+
+
+def batch_denormalize_bbox_999(
+    boxes: np.ndarray,
+    image_width: int,
+    image_height: int
+) -> np.ndarray:
+    """
+    Convert DeepSeek model coordinates (0-999) to absolute pixels for N boxes.
+    
+    Args:
+        boxes: Array of shape (N, 4) with coordinates in [0,999] range
+        image_width: Image width in pixels
+        image_height: Image height in pixels
+    
+    Returns:
+        int32 array of shape (N, 4) with absolute pixel coordinates
+    """
+    scale = np.array(
+        [image_width, image_height, image_width, image_height],
+        dtype=np.float64,
+    )
+    arr = np.array(boxes, dtype=np.float64)
+    np.multiply(arr, scale, out=arr)
+    np.multiply(arr, _INV_999, out=arr)
+    return arr.astype(np.int32, copy=False)
+
+
+def batch_filter_boxes_999(
+    coords: np.ndarray,
+    image_width: int,
+    image_height: int,
+    min_width: int = 0,
+    min_height: int = 0,
+    validate_strict: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert N DeepSeek model boxes to clipped pixel boxes and filter them.
+    
+    Equivalent to denormalize_bbox_999, validate_bbox (out-of-bounds
+    allowed), clip_bbox_to_image and a minimum size check applied to
+    every row. Uses a Numba-compiled kernel when numba is installed.
+    
+    Args:
+        coords: Array of shape (N, 4) with coordinates in [0,999] range
+        image_width: Image width in pixels
+        image_height: Image height in pixels
+        min_width: Minimum box width after clipping (default: 0)
+        min_height: Minimum box height after clipping (default: 0)
+        validate_strict: If True, reject boxes with bad ordering or a
+            negative origin (default: False)
+    
+    Returns:
+        Tuple of (int32 array of shape (N, 4) with clipped pixel
+        coordinates, bool array of shape (N,) marking boxes to keep)
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 4)
+    if _filter_boxes_999_numba is not None:
+        return _filter_boxes_999_numba(
+            coords, image_width, image_height, min_width, min_height, validate_strict
+        )
+    
+    boxes = batch_denormalize_bbox_999(coords, image_width, image_height)
+    
+    # Validate ordering and non-negative origin
+    if validate_strict:
+        keep = (
+            (boxes[:, 0] < boxes[:, 2]) & (boxes[:, 1] < boxes[:, 3])
+            & (boxes[:, 0] >= 0) & (boxes[:, 1] >= 0)
+        )
+    else:
+        keep = np.ones(len(boxes), dtype=bool)
+    
+    # Clip to image bounds (skipped when every box is already inside the
+    # image), then check minimum size
+    if (
+        boxes.min(initial=0) < 0
+        or boxes[:, 0::2].max(initial=0) > image_width
+        or boxes[:, 1::2].max(initial=0) > image_height
+    ):
+        boxes = batch_clip_bbox_to_image(boxes, image_width, image_height)
+    keep &= (boxes[:, 2] - boxes[:, 0]) >= min_width
+    keep &= (boxes[:, 3] - boxes[:, 1]) >= min_height
+    return boxes, keep
+
+
+def batch_add_padding(
+    boxes: np.ndarray,
+    padding: int,
+    image_width: int,
+    image_height: int
+) -> np.ndarray:
+    """
+    Add padding around N bounding boxes, clipping to image bounds.
+    
+    Args:
+        boxes: Array of shape (N, 4) with absolute pixel coordinates
+        padding: Padding amount in pixels
+        image_width: Image width in pixels
+        image_height: Image height in pixels
+    
+    Returns:
+        Padded array of shape (N, 4) clipped to image boundaries
+    """
+    boxes = np.asarray(boxes)
+    padded = boxes + np.array([-padding, -padding, padding, padding], dtype=boxes.dtype)
+    np.maximum(padded[:, :2], 0, out=padded[:, :2])
+    np.minimum(padded[:, 2:], (image_width, image_height), out=padded[:, 2:])
+    return padded
+
+
+def batch_clip_bbox_to_image(
+    boxes: np.ndarray,
+    image_width: int,
+    image_height: int
+) -> np.ndarray:
+    """
+    Clip N bounding boxes to image boundaries.
+    
+    Args:
+        boxes: Array of shape (N, 4) with absolute pixel coordinates
+        image_width: Image width in pixels
+        image_height: Image height in pixels
+    
+    Returns:
+        Clipped array of shape (N, 4)
+    """
+    boxes = np.asarray(boxes)
+    upper = np.array([image_width, image_height, image_width, image_height], dtype=boxes.dtype)
+    return np.clip(boxes, 0, upper)
+
+
+def batch_calculate_bbox_metrics(boxes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculate width, height, area, and aspect ratio of N bounding boxes.
+    
+    Args:
+        boxes: Array of shape (N, 4) with columns x1, y1, x2, y2
+    
+    Returns:
+        Dictionary of (N,) arrays: width, height, area, aspect_ratio
+    """
+    boxes = np.asarray(boxes, dtype=np.float64)
+    width = boxes[:, 2] - boxes[:, 0]
+    height = boxes[:, 3] - boxes[:, 1]
+    aspect_ratio = np.divide(
+        width, height, out=np.zeros_like(width), where=height > 0
+    )
+    
     return {
-        'x1': max(0, min(bbox['x1'], image_width)),
-        'y1': max(0, min(bbox['y1'], image_height)),
-        'x2': max(0, min(bbox['x2'], image_width)),
-        'y2': max(0, min(bbox['y2'], image_height)),
+        'width': width,
+        'height': height,
+        'area': width * height,
+        'aspect_ratio': aspect_ratio,
     }
+
+
+def batch_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Calculate pairwise IoU between two sets of bounding boxes.
+    
+    Vectorized equivalent of calling check_overlap for every (a, b) pair.
+    
+    Args:
+        boxes_a: Array of shape (N, 4)
+        boxes_b: Array of shape (M, 4)
+    
+    Returns:
+        Array of shape (N, M) with IoU values in [0,1]
+    """
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    
+    # Intersection coordinates, broadcast to (N, M)
+    x1_inter = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1_inter = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2_inter = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2_inter = np.minimum(a[:, None, 3], b[None, :, 3])
+    
+    inter_area = (
+        np.clip(x2_inter - x1_inter, 0, None) * np.clip(y2_inter - y1_inter, 0, None)
+    )
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union_area = area_a[:, None] + area_b[None, :] - inter_area
+    
+    return np.divide(
+        inter_area, union_area, out=np.zeros_like(inter_area), where=union_area > 0
+    )
+
+
+def batch_check_overlap(boxes: np.ndarray) -> np.ndarray:
+    """
+    Calculate the IoU between every pair of N bounding boxes.
+    
+    Uses the Numba-compiled kernel when numba is installed, otherwise
+    falls back to the NumPy implementation in batch_iou. Both compute in
+    float64 and give identical results.
+    
+    Args:
+        boxes: Array of shape (N, 4) with columns x1, y1, x2, y2
+    
+    Returns:
+        float64 array of shape (N, N) with IoU values in [0,1]
+    """
+    if _pairwise_iou_numba is not None:
+        boxes = np.ascontiguousarray(boxes, dtype=np.float64).reshape(-1, 4)
+        return _pairwise_iou_numba(boxes)
+    return batch_iou(boxes, boxes)
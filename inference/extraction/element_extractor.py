@@ -5,18 +5,31 @@ Parses grounding references from DeepSeek OCR output and extracts
 individual elements with metadata and bounding boxes.
 """
 
+import json
 import re
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
+import numpy as np
 from PIL import Image
 
-from .bbox_processor import (
-    denormalize_bbox_999,
-    validate_bbox,
-    calculate_bbox_metrics,
-    clip_bbox_to_image,
+try:
+    # RE2 matches in linear time, so long raw outputs cannot trigger
+    # backtracking on the lazy captures below
+    import re2 as _grounding_re_engine
+except ImportError:  # google-re2 is optional
+    _grounding_re_engine = re
+
+from .bbox_processor import batch_filter_boxes_999, _array_to_bboxes
+
+
+# Grounding reference: <|ref|>{label_type}<|/ref|><|det|>{coordinates}<|/det|>
+_GROUNDING_RE = _grounding_re_engine.compile(
+    r'(?s)<\|ref\|>(.*?)<\|/ref\|><\|det\|>(.*?)<\|/det\|>'
 )
 
+# Numbers in a coordinate string, for outputs that are not valid JSON
+_NUM_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
 
 def parse_grounding_references(text: str) -> List[Tuple[str, str]]:
     """
@@ -30,9 +43,7 @@ def parse_grounding_references(text: str) -> List[Tuple[str, str]]:
     Returns:
         List of tuples (label_type, coordinates_str)
     """
-    pattern = r'<\|ref\|>(.*?)<\|/ref\|><\|det\|>(.*?)<\|/det\|>'
-    matches = re.findall(pattern, text, re.DOTALL)
-    return matches
+    return _GROUNDING_RE.findall(text)
 
 
 def parse_coordinates(coords_str: str) -> Optional[List[List[float]]]:
@@ -40,19 +51,25 @@ def parse_coordinates(coords_str: str) -> Optional[List[List[float]]]:
     Parse coordinate string to list of bounding boxes.
     
     Args:
-        coords_str: String representation of coordinates (Python list format)
+        coords_str: String representation of coordinates (JSON list format)
     
     Returns:
         List of bounding boxes, each as [x1, y1, x2, y2], or None if invalid
     """
     try:
-        coords = eval(coords_str)
+        coords = json.loads(coords_str)
         if isinstance(coords, list):
             return coords
         return None
-    except Exception as e:
-        print(f"Warning: Failed to parse coordinates: {e}")
+    except (ValueError, RecursionError):
+        pass
+    
+    # Not JSON (e.g. tuple syntax): read the numbers in groups of four
+    nums = [float(n) for n in _NUM_RE.findall(coords_str)]
+    if not nums:
+        print(f"Warning: Failed to parse coordinates: {coords_str!r}")
         return None
+    return [nums[i:i + 4] for i in range(0, len(nums), 4)]
 
 
 def extract_all_elements(
@@ -104,76 +121,80 @@ def extract_all_elements(
     # Parse grounding references
     grounding_refs = parse_grounding_references(model_output)
     
-    elements = []
-    element_index = 0
-    
+    # Collect every box on the page into one array; each element keeps
+    # the [start, stop) range of its rows
+    rows = []
+    parsed_refs = []
     for label_type, coords_str in grounding_refs:
         # Parse coordinates
         coords_list = parse_coordinates(coords_str)
         if coords_list is None:
             continue
-        
-        # Convert to absolute pixels and validate
-        bounding_boxes = []
-        for coords in coords_list:
-            if len(coords) != 4:
-                continue
-            
-            # Create bbox dict from model coordinates (0-999 range)
-            bbox_model = {
-                'x1': coords[0],
-                'y1': coords[1],
-                'x2': coords[2],
-                'y2': coords[3],
-            }
-            
-            # Convert to absolute pixels
-            bbox_abs = denormalize_bbox_999(bbox_model, image_width, image_height)
-            
-            # Validate
-            if not validate_bbox(bbox_abs, image_width, image_height, allow_out_of_bounds=True):
-                if validate_strict:
-                    continue
-            
-            # Clip to image bounds
-            bbox_abs = clip_bbox_to_image(bbox_abs, image_width, image_height)
-            
-            # Check minimum size
-            width = bbox_abs['x2'] - bbox_abs['x1']
-            height = bbox_abs['y2'] - bbox_abs['y1']
-            if width < min_width or height < min_height:
-                continue
-            
-            bounding_boxes.append(bbox_abs)
-        
+        start = len(rows)
+        rows.extend(coords for coords in coords_list if len(coords) == 4)
+        parsed_refs.append((label_type, start, len(rows)))
+    
+    # Convert model coordinates (0-999 range) to absolute pixels, then
+    # validate, clip to image bounds and check minimum size
+    boxes, keep = batch_filter_boxes_999(
+        np.asarray(rows, dtype=np.float64).reshape(-1, 4),
+        image_width,
+        image_height,
+        min_width,
+        min_height,
+        validate_strict,
+    )
+    
+    # Drop rejected rows and map each element's range onto the survivors
+    boxes = boxes[keep]
+    areas = (boxes[:, 2] - boxes[:, 0]).astype(np.int64) * (boxes[:, 3] - boxes[:, 1])
+    kept_before = np.concatenate(([0], np.cumsum(keep))).tolist()
+    offsets = [kept_before[start] for _, start, _ in parsed_refs]
+    counts = [kept_before[stop] - kept_before[start] for _, start, stop in parsed_refs]
+    
+    # Per-element union bbox and total area, reduced over each element's rows
+    nonempty = [offset for offset, count in zip(offsets, counts) if count]
+    unions, total_areas = [], []
+    if nonempty:
+        unions = np.concatenate(
+            [
+                np.minimum.reduceat(boxes[:, :2], nonempty),
+                np.maximum.reduceat(boxes[:, 2:], nonempty),
+            ],
+            axis=1,
+        ).tolist()
+        total_areas = np.add.reduceat(areas, nonempty).tolist()
+    
+    # Normalize bounding boxes to 0-1 range
+    boxes_normalized = boxes / np.array(
+        [image_width, image_height, image_width, image_height], dtype=np.float64
+    )
+    
+    # Build bbox dicts only for the surviving rows
+    all_boxes = _array_to_bboxes(boxes)
+    all_boxes_normalized = _array_to_bboxes(boxes_normalized)
+    
+    elements = []
+    element_index = 0
+    
+    for (label_type, _, _), count, offset in zip(parsed_refs, counts, offsets):
         # Skip if no valid boxes
-        if not bounding_boxes:
+        if not count:
             continue
         
+        bounding_boxes = all_boxes[offset:offset + count]
+        bounding_boxes_normalized = all_boxes_normalized[offset:offset + count]
+        
         # Calculate metrics
-        total_area = sum((b['x2'] - b['x1']) * (b['y2'] - b['y1']) for b in bounding_boxes)
+        total_area = total_areas[element_index]
         
-        # Calculate overall bounding box (union of all boxes)
-        min_x1 = min(b['x1'] for b in bounding_boxes)
-        min_y1 = min(b['y1'] for b in bounding_boxes)
-        max_x2 = max(b['x2'] for b in bounding_boxes)
-        max_y2 = max(b['y2'] for b in bounding_boxes)
+        # Overall bounding box (union of all boxes)
+        min_x1, min_y1, max_x2, max_y2 = unions[element_index]
         
         overall_width = max_x2 - min_x1
         overall_height = max_y2 - min_y1
         overall_aspect_ratio = overall_width / overall_height if overall_height > 0 else 0.0
         
-        # Normalize bounding boxes to 0-1 range
-        bounding_boxes_normalized = [
-            {
-                'x1': b['x1'] / image_width,
-                'y1': b['y1'] / image_height,
-                'x2': b['x2'] / image_width,
-                'y2': b['y2'] / image_height,
-            }
-            for b in bounding_boxes
-        ]
-        
         # Create element dict
         element = {
             'id': f'page_{page_number:04d}_elem_{element_index:04d}',
@@ -224,11 +245,18 @@ def extract_element_content(
         if not bboxes:
             return None
         
-        # Calculate union bounding box
-        min_x1 = min(b['x1'] for b in bboxes)
-        min_y1 = min(b['y1'] for b in bboxes)
-        max_x2 = max(b['x2'] for b in bboxes)
-        max_y2 = max(b['y2'] for b in bboxes)
+        # Calculate union bounding box in a single pass
+        first = bboxes[0]
+        min_x1, min_y1, max_x2, max_y2 = first['x1'], first['y1'], first['x2'], first['y2']
+        for b in bboxes:
+            if b['x1'] < min_x1:
+                min_x1 = b['x1']
+            if b['y1'] < min_y1:
+                min_y1 = b['y1']
+            if b['x2'] > max_x2:
+                max_x2 = b['x2']
+            if b['y2'] > max_y2:
+                max_y2 = b['y2']
         
         # Add padding
         if padding > 0:
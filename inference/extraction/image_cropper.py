@@ -4,14 +4,76 @@ Image cropping utilities for element extraction.
 Saves individual element images with metadata.
 """
 
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from PIL import Image
 
+from .._json import write_json, write_jsonl
 from .element_extractor import extract_element_content
 
 
+# JPEG encoder settings for element crops and overlays: 4:2:0 chroma
+# subsampling, baseline, no extra Huffman optimization pass
+JPEG_SAVE_OPTIONS = {
+    'quality': 90,
+    'optimize': False,
+    'subsampling': 2,
+    'progressive': False,
+}
+
+# Upper bound on threads used by save_all_elements
+SAVE_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _save_element_image(
+    image: Image.Image,
+    element: Dict,
+    output_dir: Path,
+    padding: int = 0
+) -> Optional[Tuple[Path, Dict]]:
+    """
+    Crop and save an element image and build its metadata dict.
+    
+    Returns:
+        Tuple of (image path, metadata), or None if the element is empty
+    """
+    # Extract element content
+    element_image = extract_element_content(image, element, padding)
+    if element_image is None:
+        return None
+    
+    # Generate filename
+    element_id = element['id']
+    element_type = element['type']
+    image_filename = f"{element_id}_{element_type}.jpg"
+    image_path = output_dir / image_filename
+    
+    # Save image
+    element_image.save(image_path, **JPEG_SAVE_OPTIONS)
+    
+    # Create metadata dict
+    metadata = {
+        'element_id': element['id'],
+        'type': element['type'],
+        'page': element['page'],
+        'index': element['index'],
+        'bounding_boxes': element['bounding_boxes'],
+        'bounding_boxes_normalized': element['bounding_boxes_normalized'],
+        'metrics': element['metrics'],
+        'image_dimensions': element['image_dimensions'],
+        'cropped_image': {
+            'filename': image_filename,
+            'width': element_image.width,
+            'height': element_image.height,
+            'padding': padding,
+        },
+    }
+    
+    return image_path, metadata
+
+
 def crop_and_save_element(
     image: Image.Image,
     element: Dict,
@@ -36,45 +98,15 @@ def crop_and_save_element(
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Extract element content
-        element_image = extract_element_content(image, element, padding)
-        if element_image is None:
+        saved = _save_element_image(image, element, output_dir, padding)
+        if saved is None:
             return None
-        
-        # Generate filename
-        element_id = element['id']
-        element_type = element['type']
-        image_filename = f"{element_id}_{element_type}.jpg"
-        image_path = output_dir / image_filename
-        
-        # Save image
-        element_image.save(image_path, quality=95)
+        image_path, metadata = saved
         
         # Save metadata
         if save_metadata:
-            metadata_filename = f"{element_id}_{element_type}.json"
-            metadata_path = output_dir / metadata_filename
-            
-            # Create metadata dict
-            metadata = {
-                'element_id': element['id'],
-                'type': element['type'],
-                'page': element['page'],
-                'index': element['index'],
-                'bounding_boxes': element['bounding_boxes'],
-                'bounding_boxes_normalized': element['bounding_boxes_normalized'],
-                'metrics': element['metrics'],
-                'image_dimensions': element['image_dimensions'],
-                'cropped_image': {
-                    'filename': image_filename,
-                    'width': element_image.width,
-                    'height': element_image.height,
-                    'padding': padding,
-                },
-            }
-            
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2)
+            metadata_path = image_path.with_suffix('.json')
+            write_json(metadata_path, metadata)
         
         return image_path
     
@@ -85,7 +117,7 @@ def crop_and_save_element(
 
 def save_all_elements(
     image: Image.Image,
-    elements: list[Dict],
+    elements: List[Dict],
     output_dir: Path,
     padding: int = 0,
     save_metadata: bool = True
@@ -104,12 +136,73 @@ def save_all_elements(
         Dictionary mapping element IDs to saved image paths
     """
     saved_paths = {}
+    if not elements:
+        return saved_paths
+    
+    # Decode once up front so worker threads only read the shared pixels
+    image.load()
     
-    for element in elements:
-        image_path = crop_and_save_element(
-            image, element, output_dir, padding, save_metadata
+    # JPEG encoding and file writes release the GIL, so crops are saved
+    # concurrently; map keeps results in element order
+    with ThreadPoolExecutor(max_workers=min(SAVE_WORKERS, len(elements))) as executor:
+        image_paths = executor.map(
+            lambda element: crop_and_save_element(
+                image, element, output_dir, padding, save_metadata
+            ),
+            elements,
         )
-        if image_path:
-            saved_paths[element['id']] = image_path
+        for element, image_path in zip(elements, image_paths):
+            if image_path:
+                saved_paths[element['id']] = image_path
+    
+    return saved_paths
+
+
+def save_all_elements_batched(
+    image: Image.Image,
+    elements: List[Dict],
+    output_dir: Path,
+    padding: int = 0
+) -> Dict[str, Path]:
+    """
+    Save all elements as individual images with one metadata manifest.
+    
+    Same images as save_all_elements, but the per-element metadata is
+    written as one JSON object per line to output_dir/manifest.jsonl
+    instead of one JSON file per element.
+    
+    Args:
+        image: Source image
+        elements: List of element dictionaries
+        output_dir: Directory to save elements
+        padding: Pixels to add around elements (default: 0)
+    
+    Returns:
+        Dictionary mapping element IDs to saved image paths
+    """
+    saved_paths = {}
+    if not elements:
+        return saved_paths
+    
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    image.load()
+    
+    def save(element: Dict) -> Optional[Tuple[Path, Dict]]:
+        try:
+            return _save_element_image(image, element, output_dir, padding)
+        except Exception as e:
+            print(f"Error saving element {element.get('id', 'unknown')}: {e}")
+            return None
+    
+    manifest = []
+    with ThreadPoolExecutor(max_workers=min(SAVE_WORKERS, len(elements))) as executor:
+        for element, saved in zip(elements, executor.map(save, elements)):
+            if saved:
+                saved_paths[element['id']] = saved[0]
+                manifest.append(saved[1])
+    
+    # One encode pass and one write for the whole page
+    write_jsonl(output_dir / "manifest.jsonl", manifest)
     
     return saved_paths
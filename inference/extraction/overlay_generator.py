@@ -4,11 +4,15 @@ Overlay generator for type-specific bounding box visualizations.
 Creates separate overlay images for each element type.
 """
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 
+from .bbox_processor import _bboxes_to_array
+from .image_cropper import JPEG_SAVE_OPTIONS
+
 
 # Color scheme for different element types
 TYPE_COLORS = {
@@ -26,6 +30,12 @@ TYPE_COLORS = {
 DEFAULT_COLOR = (200, 200, 200)  # Light gray for unknown types
 
 
+@lru_cache(maxsize=1)
+def _get_default_font() -> ImageFont.ImageFont:
+    """Load Pillow's default font once and reuse it for every overlay."""
+    return ImageFont.load_default()
+
+
 def get_color_for_type(element_type: str) -> tuple:
     """Get RGB color for element type."""
     return TYPE_COLORS.get(element_type, DEFAULT_COLOR)
@@ -33,7 +43,7 @@ def get_color_for_type(element_type: str) -> tuple:
 
 def draw_element_boxes(
     draw: ImageDraw.Draw,
-    overlay: ImageDraw.Draw,
+    overlay: Optional[ImageDraw.Draw],
     elements: List[Dict],
     color: tuple,
     font: Optional[ImageFont.FreeTypeFont] = None,
@@ -44,17 +54,27 @@ def draw_element_boxes(
     
     Args:
         draw: ImageDraw object for main image
-        overlay: ImageDraw object for semi-transparent overlay
+        overlay: ImageDraw object for semi-transparent overlay, or None to
+            skip the fill (e.g. when it is built with _build_fill_overlay)
         elements: List of element dictionaries
         color: RGB color tuple
         font: Font for labels (optional)
         line_width: Width of bounding box lines
     """
     if font is None:
-        font = ImageFont.load_default()
+        font = _get_default_font()
     
     color_alpha = color + (20,)  # Semi-transparent fill
     
+    # Labels are the type names, so measure each distinct one once
+    text_sizes = {}
+    for element_type in {e['type'] for e in elements}:
+        try:
+            text_bbox = draw.textbbox((0, 0), element_type, font=font)
+        except (OSError, ValueError):
+            continue
+        text_sizes[element_type] = (text_bbox[2] - text_bbox[0], text_bbox[3] - text_bbox[1])
+    
     for element in elements:
         element_type = element['type']
         
@@ -69,28 +89,141 @@ def draw_element_boxes(
                 draw.rectangle([x1, y1, x2, y2], outline=color, width=line_width)
             
             # Draw semi-transparent fill
-            overlay.rectangle([x1, y1, x2, y2], fill=color_alpha, outline=(0, 0, 0, 0))
+            if overlay is not None:
+                overlay.rectangle([x1, y1, x2, y2], fill=color_alpha, outline=(0, 0, 0, 0))
+            
+            # Draw label (skipped if the font could not measure it)
+            text_size = text_sizes.get(element_type)
+            if text_size is None:
+                continue
+            
+            text_x = x1
+            text_y = max(0, y1 - 15)
+            text_width, text_height = text_size
+            
+            # White background for text
+            draw.rectangle(
+                [text_x, text_y, text_x + text_width, text_y + text_height],
+                fill=(255, 255, 255, 30)
+            )
             
-            # Draw label
             try:
-                text_x = x1
-                text_y = max(0, y1 - 15)
-                
-                text_bbox = draw.textbbox((0, 0), element_type, font=font)
-                text_width = text_bbox[2] - text_bbox[0]
-                text_height = text_bbox[3] - text_bbox[1]
-                
-                # White background for text
-                draw.rectangle(
-                    [text_x, text_y, text_x + text_width, text_y + text_height],
-                    fill=(255, 255, 255, 30)
-                )
-                
                 draw.text((text_x, text_y), element_type, font=font, fill=color)
-            except:
+            except (OSError, ValueError):
                 pass
 
 
+def _group_elements_by_type(elements: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Group elements by type, keeping first-seen type order.
+    
+    Args:
+        elements: List of element dictionaries
+    
+    Returns:
+        Dictionary mapping element type to its elements
+    """
+    elements_by_type = {}
+    for element in elements:
+        elements_by_type.setdefault(element['type'], []).append(element)
+    return elements_by_type
+
+
+def _build_fill_overlay(
+    size: tuple,
+    elements_by_type: Dict[str, List[Dict]]
+) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+    """
+    Build the semi-transparent fill layer for all boxes with NumPy slice fills.
+    
+    Matches ImageDraw.rectangle(fill=color_alpha, outline=(0, 0, 0, 0)) on a
+    transparent RGBA layer: the inclusive box is filled, then its 1px border
+    is cleared. For a zero-height box Pillow draws the side lines one row
+    further down, so that row's two end pixels are cleared too. Pixels are
+    stored as packed uint32 so each fill is a single
+    scalar assignment per row. The layer only spans the union of the boxes,
+    so compositing touches just that region.
+    
+    Returns:
+        Tuple of (RGBA layer, (left, top) paste offset), or None if no box
+        is visible
+    """
+    width, height = size
+    
+    # Stack every box once as an (N, 4) array plus a packed color per row
+    bboxes = []
+    pixels = []
+    for element_type, type_elements in elements_by_type.items():
+        color_alpha = get_color_for_type(element_type) + (20,)
+        pixel = np.frombuffer(bytes(color_alpha), dtype=np.uint32)[0]
+        for element in type_elements:
+            bboxes.extend(element['bounding_boxes'])
+            pixels.extend([pixel] * len(element['bounding_boxes']))
+    boxes = _bboxes_to_array(bboxes, dtype=np.int64)
+    
+    # Drop inverted boxes and boxes entirely above/left of the image; a
+    # zero-height box reaches one row below its y2
+    visible = (
+        (boxes[:, 2] >= boxes[:, 0]) & (boxes[:, 3] >= boxes[:, 1])
+        & (boxes[:, 2] >= 0) & (boxes[:, 3] + (boxes[:, 1] == boxes[:, 3]) >= 0)
+    )
+    if not visible.any():
+        return None
+    pixels = [pixel for pixel, keep in zip(pixels, visible.tolist()) if keep]
+    boxes = boxes[visible]
+    
+    # Layer spans the union of the visible boxes, clipped to the image
+    left, top = np.maximum(boxes[:, :2].min(axis=0), 0).tolist()
+    right, bottom = np.minimum(boxes[:, 2:].max(axis=0) + 1, (width, height)).tolist()
+    if right <= left or bottom <= top:
+        return None
+    
+    overlay = np.zeros((bottom - top, right - left), dtype=np.uint32)
+    for (x1, y1, x2, y2), pixel in zip(boxes.tolist(), pixels):
+        rows = slice(max(y1, 0) - top, y2 + 1 - top)
+        cols = slice(max(x1, 0) - left, x2 + 1 - left)
+        overlay[rows, cols] = pixel
+        
+        # Transparent 1px border, skipping edges outside the image
+        for y in (y1, y2):
+            if 0 <= y < height:
+                overlay[y - top, cols] = 0
+        for x in (x1, x2):
+            if 0 <= x < width:
+                overlay[rows, x - left] = 0
+                if y1 == y2 and top <= y1 + 1 < bottom:
+                    overlay[y1 + 1 - top, x - left] = 0
+    
+    layer = Image.frombuffer(
+        'RGBA', (right - left, bottom - top), overlay, 'raw', 'RGBA', 0, 1
+    )
+    return layer, (left, top)
+
+
+def _render_overlay(
+    image: Image.Image,
+    elements_by_type: Dict[str, List[Dict]],
+    font: Optional[ImageFont.FreeTypeFont] = None
+) -> Image.Image:
+    """Draw pre-grouped elements, each type in its color, onto a copy of image."""
+    # Create drawing contexts
+    img_draw = image.copy()
+    draw = ImageDraw.Draw(img_draw)
+    fill = _build_fill_overlay(img_draw.size, elements_by_type)
+    
+    # Draw each type's outlines and labels with its color
+    for element_type, type_elements in elements_by_type.items():
+        color = get_color_for_type(element_type)
+        draw_element_boxes(draw, None, type_elements, color, font)
+    
+    # Composite overlay over the region it covers
+    if fill is not None:
+        overlay, offset = fill
+        img_draw.paste(overlay, offset, overlay)
+    
+    return img_draw
+
+
 def generate_type_overlay(
     image: Image.Image,
     elements: List[Dict],
@@ -116,22 +249,7 @@ def generate_type_overlay(
         # Return original image if no elements of this type
         return image.copy()
     
-    # Create drawing contexts
-    img_draw = image.copy()
-    draw = ImageDraw.Draw(img_draw)
-    overlay = Image.new('RGBA', img_draw.size, (0, 0, 0, 0))
-    draw2 = ImageDraw.Draw(overlay)
-    
-    # Get color for this type
-    color = get_color_for_type(element_type)
-    
-    # Draw boxes
-    draw_element_boxes(draw, draw2, filtered_elements, color, font)
-    
-    # Composite overlay
-    img_draw.paste(overlay, (0, 0), overlay)
-    
-    return img_draw
+    return _render_overlay(image, {element_type: filtered_elements}, font)
 
 
 def generate_all_types_overlay(
@@ -153,29 +271,7 @@ def generate_all_types_overlay(
     if not elements:
         return image.copy()
     
-    # Create drawing contexts
-    img_draw = image.copy()
-    draw = ImageDraw.Draw(img_draw)
-    overlay = Image.new('RGBA', img_draw.size, (0, 0, 0, 0))
-    draw2 = ImageDraw.Draw(overlay)
-    
-    # Group elements by type
-    elements_by_type = {}
-    for element in elements:
-        element_type = element['type']
-        if element_type not in elements_by_type:
-            elements_by_type[element_type] = []
-        elements_by_type[element_type].append(element)
-    
-    # Draw each type with its color
-    for element_type, type_elements in elements_by_type.items():
-        color = get_color_for_type(element_type)
-        draw_element_boxes(draw, draw2, type_elements, color, font)
-    
-    # Composite overlay
-    img_draw.paste(overlay, (0, 0), overlay)
-    
-    return img_draw
+    return _render_overlay(image, _group_elements_by_type(elements), font)
 
 
 def generate_type_overlays(
@@ -207,24 +303,29 @@ def generate_type_overlays(
     if not elements:
         return saved_overlays
     
-    # Get unique element types
-    element_types = sorted(set(e['type'] for e in elements))
+    # Load the label font once for all overlays of this page
+    font = font or _get_default_font()
+    
+    # Group elements by type once for all overlays
+    elements_by_type = _group_elements_by_type(elements)
     
     # Generate per-type overlays
-    for element_type in element_types:
-        overlay_image = generate_type_overlay(image, elements, element_type, font)
+    for element_type in sorted(elements_by_type):
+        overlay_image = _render_overlay(
+            image, {element_type: elements_by_type[element_type]}, font
+        )
         
         # Save overlay
         filename = f"{element_type}_only.jpg"
         filepath = output_dir / filename
-        overlay_image.save(filepath, quality=95)
+        overlay_image.save(filepath, **JPEG_SAVE_OPTIONS)
         
         saved_overlays[element_type] = filepath
     
     # Generate combined overlay with all types
-    all_types_overlay = generate_all_types_overlay(image, elements, font)
+    all_types_overlay = _render_overlay(image, elements_by_type, font)
     all_types_path = output_dir / "all_types_colored.jpg"
-    all_types_overlay.save(all_types_path, quality=95)
+    all_types_overlay.save(all_types_path, **JPEG_SAVE_OPTIONS)
     saved_overlays['all_types'] = all_types_path
     
     return saved_overlays
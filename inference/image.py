@@ -1,40 +1,81 @@
 """Image inference utilities for DeepSeek OCR on CPU."""
 
+import inspect
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Union, Tuple
+import torch
 from PIL import Image
 
 from .model_loader import load_model_and_tokenizer
-from .performance_metrics import PerformanceMetrics, count_tokens
+from .performance_metrics import PerformanceMetrics, count_tokens_batch
 
+OCR_PROMPT = "<image>\n<|grounding|>Convert the document to markdown. "
 
-def process_image(image_path: str, output_dir: Optional[str] = None) -> str:
-    """Run OCR on a single image using the DeepSeek model on CPU."""
+
+@lru_cache(maxsize=None)
+def _infer_supports_return_raw(infer_func) -> bool:
+    """Check whether model.infer accepts return_raw (patched model code)."""
+    try:
+        return 'return_raw' in inspect.signature(infer_func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def process_image(
+    image_path: str,
+    output_dir: Optional[str] = None,
+    tokenizer=None,
+    model=None,
+    return_raw: bool = False,
+) -> Union[str, Tuple[str, Optional[str]]]:
+    """
+    Run OCR on a single image using the DeepSeek model on CPU.
+    
+    A preloaded tokenizer and model can be injected; otherwise the cached
+    instances from load_model_and_tokenizer are used.
+    
+    When return_raw is True, returns (markdown, raw_output) where raw_output
+    is the model output with grounding references. It comes straight from
+    the model when the patched infer supports it, otherwise from
+    result_raw.txt in output_dir, and is None if neither is available.
+    """
     image_path = str(Path(image_path).expanduser().resolve())
     output_dir_path: Optional[Path] = None
     if output_dir is not None:
         output_dir_path = Path(output_dir).expanduser().resolve()
         output_dir = str(output_dir_path)
 
-    tokenizer, model = load_model_and_tokenizer()
+    if tokenizer is None or model is None:
+        tokenizer, model = load_model_and_tokenizer()
 
-    prompt = "<image>\n<|grounding|>Convert the document to markdown. "
+    prompt = OCR_PROMPT
+    
+    infer_kwargs = {}
+    if return_raw and _infer_supports_return_raw(model.infer):
+        infer_kwargs['return_raw'] = True
     
     start_time = time.time()
-    result = model.infer(
-        tokenizer,
-        prompt=prompt,
-        image_file=image_path,
-        output_path=output_dir or "",
-        base_size=1024,
-        image_size=640,
-        crop_mode=True,
-        save_results=bool(output_dir),
-        test_compress=True,
-    )
+    with torch.inference_mode():
+        result = model.infer(
+            tokenizer,
+            prompt=prompt,
+            image_file=image_path,
+            output_path=output_dir or "",
+            base_size=1024,
+            image_size=640,
+            crop_mode=True,
+            save_results=bool(output_dir),
+            test_compress=True,
+            **infer_kwargs,
+        )
     elapsed = time.time() - start_time
     
+    raw_output = None
+    if isinstance(result, tuple):
+        result, raw_output = result
+    
     if result is None and output_dir_path:
         result_file = output_dir_path / "result.mmd"
         if result_file.is_file():
@@ -43,17 +84,28 @@ def process_image(image_path: str, output_dir: Optional[str] = None) -> str:
     if result is None:
         raise RuntimeError("Model inference did not return any output.")
 
+    if return_raw:
+        if raw_output is None and output_dir_path:
+            raw_file = output_dir_path / "result_raw.txt"
+            if raw_file.is_file():
+                raw_output = raw_file.read_text(encoding="utf-8")
+        return result, raw_output
+
     return result
 
 
 def process_image_with_metrics(
-    image_path: str, output_dir: Optional[str] = None
+    image_path: str,
+    output_dir: Optional[str] = None,
+    tokenizer=None,
+    model=None,
 ) -> Tuple[str, PerformanceMetrics]:
     """
     Run OCR on a single image and return result with performance metrics.
     
     Measures only inference time (model output generation), excluding model loading.
-    Model is cached after first load.
+    Model is cached after first load; a preloaded tokenizer and model can be
+    injected instead.
     
     Returns:
         Tuple of (result_text, performance_metrics)
@@ -65,24 +117,25 @@ def process_image_with_metrics(
         output_dir = str(output_dir_path)
 
     # Load model (cached after first call)
-    tokenizer, model = load_model_and_tokenizer()
+    if tokenizer is None or model is None:
+        tokenizer, model = load_model_and_tokenizer()
 
-    prompt = "<image>\n<|grounding|>Convert the document to markdown. "
-    input_tokens = count_tokens(prompt, tokenizer)
+    prompt = OCR_PROMPT
     
     # Start timing ONLY the inference call
     start_time = time.time()
-    result = model.infer(
-        tokenizer,
-        prompt=prompt,
-        image_file=image_path,
-        output_path=output_dir or "",
-        base_size=1024,
-        image_size=640,
-        crop_mode=True,
-        save_results=bool(output_dir),
-        test_compress=True,
-    )
+    with torch.inference_mode():
+        result = model.infer(
+            tokenizer,
+            prompt=prompt,
+            image_file=image_path,
+            output_path=output_dir or "",
+            base_size=1024,
+            image_size=640,
+            crop_mode=True,
+            save_results=bool(output_dir),
+            test_compress=True,
+        )
     inference_time = time.time() - start_time
     
     if result is None and output_dir_path:
@@ -93,8 +146,8 @@ def process_image_with_metrics(
     if result is None:
         raise RuntimeError("Model inference did not return any output.")
 
-    # Count output tokens
-    output_tokens = count_tokens(result, tokenizer)
+    # Count input and output tokens in one tokenizer call
+    input_tokens, output_tokens = count_tokens_batch([prompt, result], tokenizer)
     
     # Create metrics based only on inference time
     tokens_per_sec = output_tokens / inference_time if inference_time > 0 else 0
@@ -115,6 +168,9 @@ def process_image_enhanced(
     extract_options: Optional[Dict] = None,
     generate_overlays: bool = True,
     save_elements: bool = True,
+    tokenizer=None,
+    model=None,
+    element_manifest: bool = False,
 ) -> Dict:
     """
     Run OCR on a single image with enhanced element extraction.
@@ -128,6 +184,10 @@ def process_image_enhanced(
         extract_options: Options for element extraction (see extract_all_elements)
         generate_overlays: Whether to generate type-specific overlay images
         save_elements: Whether to save individual element images
+        tokenizer: Preloaded tokenizer (optional, loaded on demand if None)
+        model: Preloaded model (optional, loaded on demand if None)
+        element_manifest: Write element metadata to one manifest.jsonl
+            instead of one JSON file per element (default: False)
     
     Returns:
         Dictionary with:
@@ -144,17 +204,20 @@ def process_image_enhanced(
     from .extraction import (
         extract_all_elements,
         save_all_elements,
+        save_all_elements_batched,
         generate_type_overlays,
     )
     
-    # Process with standard pipeline first
-    markdown = process_image(image_path, output_dir)
+    # Process with standard pipeline first, keeping the raw output with
+    # grounding references
+    markdown, raw_output = process_image(
+        image_path, output_dir, tokenizer=tokenizer, model=model, return_raw=True
+    )
     
     output_dir_path = Path(output_dir).expanduser().resolve()
     
-    # Load the raw output with grounding references
-    raw_output_path = output_dir_path / "result_raw.txt"
-    if not raw_output_path.exists():
+    if raw_output is None:
+        raw_output_path = output_dir_path / "result_raw.txt"
         # List files in directory for debugging
         import os
         files = os.listdir(output_dir_path) if output_dir_path.exists() else []
@@ -165,11 +228,12 @@ def process_image_enhanced(
             f"Ensure the model is saving result_raw.txt"
         )
     
-    with open(raw_output_path, 'r', encoding='utf-8') as f:
-        raw_output = f.read()
-    
-    # Load the image
+    # Decode the page once as RGB; extraction, crops and overlays all
+    # share this image
     image = Image.open(image_path)
+    image.load()
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
     
     # Extract elements
     elements = extract_all_elements(
@@ -190,7 +254,10 @@ def process_image_enhanced(
     # Save individual elements
     if save_elements:
         elements_dir = output_dir_path / "elements"
-        element_paths = save_all_elements(image, elements, elements_dir)
+        if element_manifest:
+            element_paths = save_all_elements_batched(image, elements, elements_dir)
+        else:
+            element_paths = save_all_elements(image, elements, elements_dir)
         result['element_paths'] = element_paths
     
     # Generate type-specific overlays
@@ -8,10 +8,15 @@ creating search indices.
 
 __version__ = "0.1.0"
 
-from .manifest_builder import build_image_manifest
-from .context_extractor import extract_element_context
-from .reference_resolver import resolve_references
-from .search_indexer import build_search_index
+from .._lazy import lazy_exports
+
+# Submodules are imported on first access to one of their names
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "build_image_manifest": "manifest_builder",
+    "extract_element_context": "context_extractor",
+    "resolve_references": "reference_resolver",
+    "build_search_index": "search_indexer",
+})
 
 __all__ = [
     "build_image_manifest",
@@ -19,3 +24,4 @@ __all__ = [
     "resolve_references",
     "build_search_index",
 ]
+
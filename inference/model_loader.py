@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import os
+import threading
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 import torch
 from transformers import AutoModel, AutoTokenizer
@@ -13,10 +15,103 @@ MODEL_PATH = Path(__file__).resolve().parent.parent / "model_data" / MODEL_ID
 
 _MODEL = None
 _TOKENIZER = None
+_LOAD_LOCK = threading.Lock()
 
+_THREADS_CONFIGURED = False
 
-def load_model_and_tokenizer(device: str | torch.device = "cpu") -> Tuple[AutoTokenizer, AutoModel]:
-	"""Load and cache the DeepSeek OCR tokenizer and model on the requested device."""
+# Supported values of DEEPSEEK_OCR_DTYPE; empty keeps the checkpoint dtype
+_DTYPES = ("", "auto", "bfloat16", "int8")
+
+
+def _resolve_dtype() -> str:
+	"""Read DEEPSEEK_OCR_DTYPE, resolving "auto" from the CPU's BF16 support."""
+	dtype = os.environ.get("DEEPSEEK_OCR_DTYPE", "").strip().lower()
+	if dtype not in _DTYPES:
+		raise ValueError(
+			f"Unsupported DEEPSEEK_OCR_DTYPE '{dtype}', expected one of: {', '.join(_DTYPES[1:])}"
+		)
+	if dtype == "auto":
+		# Native BF16 (AVX-512 BF16 / AMX) makes bf16 weights fast; older
+		# CPUs do better with int8 dynamic quantization
+		bf16_supported = getattr(torch.cpu, "_is_avx512_bf16_supported", None)
+		dtype = "bfloat16" if bf16_supported is not None and bf16_supported() else "int8"
+	return dtype
+
+
+def _optimize_model(model, dtype: str):
+	"""Apply the graph optimization selected by DEEPSEEK_OCR_COMPILE, if any."""
+	backend = os.environ.get("DEEPSEEK_OCR_COMPILE", "").strip().lower()
+	if not backend:
+		return model
+
+	if backend == "ipex":
+		import intel_extension_for_pytorch as ipex
+
+		return ipex.optimize(
+			model,
+			dtype=torch.bfloat16 if dtype == "bfloat16" else torch.float32,
+			inplace=True,
+		)
+
+	if backend == "inductor":
+		# Only the image encoders are compiled: they run once per image with
+		# fixed input sizes, while the decoder's growing KV cache would
+		# trigger recompiles
+		inner = getattr(model, "model", None)
+		for name in ("sam_model", "vision_model"):
+			encoder = getattr(inner, name, None)
+			if encoder is not None:
+				setattr(inner, name, torch.compile(encoder, backend="inductor"))
+		return model
+
+	raise ValueError(
+		f"Unsupported DEEPSEEK_OCR_COMPILE '{backend}', expected one of: ipex, inductor"
+	)
+
+
+def _physical_core_count() -> int:
+	"""Physical CPU cores, falling back to logical CPUs without psutil."""
+	try:
+		import psutil
+	except ImportError:
+		psutil = None
+	cores = psutil.cpu_count(logical=False) if psutil is not None else None
+	return cores or os.cpu_count() or 1
+
+
+def default_num_threads() -> int:
+	"""Intra-op threads for one inference process."""
+	# One intra-op thread per physical core; hyperthreads contend for the
+	# same vector units. DEEPSEEK_OCR_NUM_THREADS overrides the count.
+	return int(os.environ.get("DEEPSEEK_OCR_NUM_THREADS", 0)) or _physical_core_count()
+
+
+def _configure_threads(num_threads: Optional[int] = None) -> None:
+	"""Size torch's thread pools once per process before the first inference."""
+	global _THREADS_CONFIGURED
+
+	if _THREADS_CONFIGURED:
+		return
+	_THREADS_CONFIGURED = True
+
+	torch.set_num_threads(num_threads or default_num_threads())
+	try:
+		# Inference runs one op graph at a time, so a single inter-op thread
+		torch.set_num_interop_threads(1)
+	except RuntimeError:
+		# Already fixed once any parallel work has run in this process
+		pass
+
+
+def load_model_and_tokenizer(
+	device: str | torch.device = "cpu", num_threads: Optional[int] = None
+) -> Tuple[AutoTokenizer, AutoModel]:
+	"""
+	Load and cache the DeepSeek OCR tokenizer and model on the requested device.
+
+	num_threads sets this process's intra-op thread count (default:
+	default_num_threads()). It only takes effect on the first call.
+	"""
 	global _MODEL, _TOKENIZER
 
 	if not MODEL_PATH.exists():
@@ -27,22 +122,42 @@ def load_model_and_tokenizer(device: str | torch.device = "cpu") -> Tuple[AutoTo
 	if isinstance(device, str):
 		device = torch.device(device)
 
-	if _TOKENIZER is None:
-		_TOKENIZER = AutoTokenizer.from_pretrained(
-			str(MODEL_PATH),
-			trust_remote_code=True,
-			local_files_only=True,
-		)
+	# Serialize loading so concurrent first callers share a single load
+	with _LOAD_LOCK:
+		_configure_threads(num_threads)
+
+		if _TOKENIZER is None:
+			_TOKENIZER = AutoTokenizer.from_pretrained(
+				str(MODEL_PATH),
+				trust_remote_code=True,
+				local_files_only=True,
+			)
+
+		if _MODEL is None:
+			dtype = _resolve_dtype()
+			load_kwargs = {"torch_dtype": torch.bfloat16} if dtype == "bfloat16" else {}
+			_MODEL = AutoModel.from_pretrained(
+				str(MODEL_PATH),
+				trust_remote_code=True,
+				use_safetensors=True,
+				local_files_only=True,
+				**load_kwargs,
+			).eval()
+			if dtype == "int8":
+				# Dynamic int8 quantization of the linear layers (CPU only)
+				_MODEL = torch.ao.quantization.quantize_dynamic(
+					_MODEL, {torch.nn.Linear}, dtype=torch.qint8
+				)
+
+			# NHWC weights let oneDNN pick its fused conv kernels for the
+			# SAM image encoder
+			sam_model = getattr(getattr(_MODEL, "model", None), "sam_model", None)
+			if sam_model is not None:
+				sam_model.to(memory_format=torch.channels_last)
 
-	if _MODEL is None:
-		_MODEL = AutoModel.from_pretrained(
-			str(MODEL_PATH),
-			trust_remote_code=True,
-			use_safetensors=True,
-			local_files_only=True,
-		).eval()
+			_MODEL = _optimize_model(_MODEL, dtype)
 
-	if _MODEL.device != device:
-		_MODEL.to(device)
+		if _MODEL.device != device:
+			_MODEL.to(device)
 
 	return _TOKENIZER, _MODEL
@@ -1,48 +1,370 @@
 """PDF inference utilities for DeepSeek OCR on CPU."""
 
+import multiprocessing
+import queue
+import threading
 import time
+from collections import Counter
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import closing, contextmanager
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
+from typing import Iterable, Iterator, List, Optional, Dict, Tuple
 import json
 
+from ._json import read_json, write_json
 from .image import process_image, process_image_enhanced, process_image_with_metrics
-from .pdf_to_images import pdf_to_images
-from .performance_metrics import AggregateMetrics, PerformanceTracker
+from .model_loader import default_num_threads, load_model_and_tokenizer
+from .pdf_to_images import get_page_count, iter_pdf_pages
+from .performance_metrics import AggregateMetrics, PerformanceMetrics, PerformanceTracker
 
 
-def _convert_pdf_to_images(pdf_path: Path, output_dir: Path) -> List[str]:
-    pages_dir = output_dir / "pages"
-    pages_dir.mkdir(parents=True, exist_ok=True)
-    return pdf_to_images(str(pdf_path), str(pages_dir))
+def _init_page_worker(num_threads: int) -> None:
+    """Process pool initializer: load the model once per worker process."""
+    load_model_and_tokenizer(num_threads=num_threads)
+
+
+def _process_page(image_path: str, output_dir: str) -> str:
+    """Run OCR on one page inside a pool worker using its cached model."""
+    return process_image(image_path, output_dir=output_dir)
+
+
+def _process_page_enhanced(
+    image_path: str,
+    output_dir: str,
+    extract_options: Optional[Dict],
+    generate_overlays: bool,
+    save_elements: bool,
+    element_manifest: bool,
+) -> Dict:
+    """
+    Run enhanced OCR on one page inside a pool worker using its cached model.
+    
+    The page's elements are written to its elements.json here and left out
+    of the result, so they are neither serialized by the parent process nor
+    pickled back to it.
+    """
+    page_result = process_image_enhanced(
+        image_path=image_path,
+        output_dir=output_dir,
+        extract_options=extract_options,
+        generate_overlays=generate_overlays,
+        save_elements=save_elements,
+        element_manifest=element_manifest,
+    )
+    return _summarize_page(page_result, output_dir, keep_elements=False)
 
 
-def process_pdf(pdf_path: str, output_dir: Optional[str] = None) -> str:
-    """Run OCR on each PDF page by converting to images and aggregating results."""
-    pdf_path_obj = Path(pdf_path).expanduser().resolve()
+def _summarize_page(page_result: Dict, output_dir: str, keep_elements: bool) -> Dict:
+    """
+    Write a page's elements to output_dir/elements.json and record their
+    path and per-type counts in page_result, dropping the elements
+    themselves unless keep_elements is set.
+    """
+    elements = page_result['elements'] if keep_elements else page_result.pop('elements')
+    elements_path = Path(output_dir) / "elements.json"
+    write_json(elements_path, elements)
+    page_result['elements_path'] = str(elements_path)
+    page_result['element_counts'] = dict(Counter(e['type'] for e in elements))
+    return page_result
+
+
+def _process_page_with_metrics(image_path: str, output_dir: str) -> Tuple[str, PerformanceMetrics]:
+    """Run OCR on one page inside a pool worker using its cached model."""
+    return process_image_with_metrics(image_path, output_dir=output_dir)
+
+
+def create_page_pool(num_workers: int) -> ProcessPoolExecutor:
+    """
+    Create a process pool for page-level OCR.
+    
+    Each worker loads its own copy of the model on startup, so memory use
+    grows with num_workers. The inference threads are split between the
+    workers so together they don't oversubscribe the cores. Workers are
+    spawned rather than forked so no torch state is inherited from the
+    parent.
+    """
+    num_threads = max(1, default_num_threads() // num_workers)
+    return ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_page_worker,
+        initargs=(num_threads,),
+    )
+
+
+@contextmanager
+def _page_executor(executor: Optional[Executor], num_workers: int) -> Iterator[Optional[Executor]]:
+    """
+    Yield the page pool to use for a PDF call.
+    
+    Uses the given executor if any, otherwise a temporary pool when
+    num_workers > 1, otherwise None (pages run in this process).
+    """
+    if executor is not None or num_workers <= 1:
+        yield executor
+        return
+    with create_page_pool(num_workers) as pool:
+        yield pool
+
+
+def _absolute_path(path) -> Path:
+    """Return path as an absolute Path, skipping resolve() if it already is one."""
+    path = Path(path).expanduser()
+    return path if path.is_absolute() else path.resolve()
+
+
+def _prepare_io(pdf_path: str, output_dir: Optional[str]) -> Tuple[Path, Path]:
+    """
+    Validate the input PDF and create the output root for a process_pdf* call.
+    
+    Returns:
+        Tuple of (PDF path, output root), defaulting the output root to
+        <pdf stem>_outputs next to the PDF
+    """
+    pdf_path_obj = _absolute_path(pdf_path)
     if not pdf_path_obj.is_file():
         raise FileNotFoundError(f"PDF file not found: {pdf_path_obj}")
-
-    output_root = Path(output_dir).expanduser().resolve() if output_dir else pdf_path_obj.parent / f"{pdf_path_obj.stem}_outputs"
+    
+    output_root = (
+        _absolute_path(output_dir) if output_dir
+        else pdf_path_obj.parent / f"{pdf_path_obj.stem}_outputs"
+    )
     output_root.mkdir(parents=True, exist_ok=True)
+    return pdf_path_obj, output_root
 
-    image_paths = _convert_pdf_to_images(pdf_path_obj, output_root)
-    if not image_paths:
-        raise ValueError(f"No pages found in PDF: {pdf_path_obj}")
 
-    page_markdowns: List[str] = []
-    for index, image_path in enumerate(image_paths, start=1):
-        page_output_dir = output_root / f"page_{index:04d}"
-        page_output_dir.mkdir(parents=True, exist_ok=True)
-        page_markdown = process_image(image_path, output_dir=str(page_output_dir))
-        page_markdowns.append(page_markdown.strip())
+@contextmanager
+def _submit_pages(
+    pool: Optional[Executor], page_fn, image_paths: Iterable[str], page_dirs: List[str], *args
+) -> Iterator[Tuple[Iterable[str], Optional[List[Future]]]]:
+    """
+    Submit each page to the pool, if any, as soon as its image is available.
+    
+    Yields the page image paths and futures, both in page order. Without a
+    pool the paths are passed through and futures is None. If submitting
+    or the caller fails, pages that have not started are cancelled rather
+    than left to run to completion.
+    """
+    if pool is None:
+        yield image_paths, None
+        return
+    
+    submitted_paths: List[str] = []
+    futures: List[Future] = []
+    try:
+        for image_path, page_output_dir in zip(image_paths, page_dirs):
+            futures.append(pool.submit(page_fn, image_path, page_output_dir, *args))
+            submitted_paths.append(image_path)
+        yield submitted_paths, futures
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+
+def _make_page_dirs(output_root: Path, first_page: int, num_pages: int) -> List[str]:
+    """Create the page_NNNN output directories for a run of pages and return their paths."""
+    page_dirs = []
+    for index in range(first_page, first_page + num_pages):
+        page_dir = output_root / f"page_{index:04d}"
+        page_dir.mkdir(exist_ok=True)
+        page_dirs.append(str(page_dir))
+    return page_dirs
+
 
+def _write_combined_markdown(combined_path: Path, page_markdowns: List[str]) -> str:
+    """
+    Join the per-page markdown under page markers, write it to
+    combined_path and return it.
+    
+    The text is built once and written in a single call; callers return
+    it, so streaming the pages to disk would not lower peak memory.
+    """
     combined_markdown = "\n\n".join(
         f"<!-- Page {idx} -->\n{content}" if content else f"<!-- Page {idx} -->"
         for idx, content in enumerate(page_markdowns, start=1)
     )
-
-    combined_path = output_root / f"{pdf_path_obj.stem}.md"
     combined_path.write_text(combined_markdown, encoding="utf-8")
+    return combined_markdown
+
+
+def _page_cache_key(pdf_path: Path, dpi: int, image_format: str) -> str:
+    """
+    Key rendered pages by the PDF's file identity, dpi and format.
+    
+    Uses size, mtime and inode rather than a content hash, so checking the
+    cache never reads the whole PDF; any rewrite of the file changes the key.
+    """
+    stat = pdf_path.stat()
+    return f"{stat.st_size}_{stat.st_mtime_ns}_{stat.st_ino}_{dpi}_{image_format.lower()}"
+
+
+# Sentinel the render thread queues after the last page
+_PAGES_DONE = object()
+
+
+def _render_ahead(
+    pdf_path: Path,
+    pages_dir: Path,
+    page_indices: range,
+    manifest_path: Optional[Path],
+    dpi: int,
+    image_format: str,
+) -> Iterator[str]:
+    """
+    Yield page image paths rendered by a producer thread.
+    
+    The thread renders into a queue of two pages, so it stays just ahead
+    of the consumer and rendering overlaps processing of the previous
+    page. If the consumer stops early the thread stops too. The manifest
+    is written once all pages have been rendered.
+    """
+    pages: queue.Queue = queue.Queue(maxsize=2)
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce() -> None:
+        image_names = []
+        try:
+            for image_path in iter_pdf_pages(
+                str(pdf_path), str(pages_dir), page_indices, dpi=dpi, image_format=image_format
+            ):
+                if not put(image_path):
+                    return
+                image_names.append(Path(image_path).name)
+            if manifest_path is not None:
+                manifest_path.write_text(json.dumps(image_names))
+        except Exception as e:
+            put(e)
+            return
+        put(_PAGES_DONE)
+    
+    producer = threading.Thread(target=produce, name="pdf-page-render", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = pages.get()
+            if item is _PAGES_DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # The producer notices within one page render or put timeout
+        producer.join()
+
+
+def _open_page_images(
+    pdf_path: Path,
+    output_dir: Path,
+    start_page: Optional[int] = None,
+    end_page: Optional[int] = None,
+    dpi: int = 200,
+    image_format: str = "png",
+) -> Tuple[int, Iterator[str]]:
+    """
+    Select the PDF pages to process and return their count and image paths.
+    
+    Page images live in output_dir/pages. A previous render of the whole
+    PDF is reused when its manifest, keyed by _page_cache_key, exists and
+    all listed pages are still on disk. Otherwise only the selected pages
+    are rendered, in the background, as the returned iterator is consumed.
+    
+    Args:
+        pdf_path: Path to input PDF
+        output_dir: Output root for the PDF
+        start_page: Starting page number (1-indexed, inclusive)
+        end_page: Ending page number (1-indexed, inclusive)
+        dpi: Render resolution (default: 200)
+        image_format: Page image format (default: "png")
+    
+    Returns:
+        Tuple of (number of selected pages, iterator over their image paths)
+    """
+    pages_dir = output_dir / "pages"
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    
+    page_count = get_page_count(str(pdf_path))
+    if page_count == 0:
+        raise ValueError(f"No pages found in PDF: {pdf_path}")
+    
+    # Apply page range filtering
+    page_indices = range(page_count)
+    if start_page is not None or end_page is not None:
+        start_idx = (start_page - 1) if start_page is not None else 0
+        end_idx = end_page if end_page is not None else page_count
+        page_indices = page_indices[start_idx:end_idx]
+        
+        if not page_indices:
+            raise ValueError(f"No pages in range {start_page}-{end_page}")
+    
+    manifest_path = pages_dir / f".manifest_{_page_cache_key(pdf_path, dpi, image_format)}.json"
+    try:
+        image_paths = [str(pages_dir / name) for name in json.loads(manifest_path.read_text())]
+        if len(image_paths) == page_count and all(Path(path).is_file() for path in image_paths):
+            return len(page_indices), (image_paths[i] for i in page_indices)
+    except (OSError, ValueError):
+        pass
+    
+    # Rendering overwrites the page files other manifests point at
+    for stale_manifest in pages_dir.glob(".manifest_*.json"):
+        stale_manifest.unlink(missing_ok=True)
+    
+    # Only a render of the whole document can be reused later
+    if len(page_indices) < page_count:
+        manifest_path = None
+    return len(page_indices), _render_ahead(
+        pdf_path, pages_dir, page_indices, manifest_path, dpi, image_format
+    )
+
+
+def process_pdf(
+    pdf_path: str,
+    output_dir: Optional[str] = None,
+    tokenizer=None,
+    model=None,
+    executor: Optional[Executor] = None,
+    num_workers: int = 1,
+) -> str:
+    """
+    Run OCR on each PDF page by converting to images and aggregating results.
+    
+    Pages are processed concurrently when a page pool is given as executor
+    or num_workers > 1; the tokenizer/model arguments are then ignored.
+    """
+    pdf_path_obj, output_root = _prepare_io(pdf_path, output_dir)
+
+    num_pages, image_paths = _open_page_images(pdf_path_obj, output_root)
+
+    page_markdowns: List[str] = []
+    page_dirs = _make_page_dirs(output_root, 1, num_pages)
+    # With a page pool, every page is submitted up front and collected in page order
+    with (
+        closing(image_paths),
+        _page_executor(executor, num_workers) as pool,
+        _submit_pages(pool, _process_page, image_paths, page_dirs) as (image_paths, futures),
+    ):
+        for position, (image_path, page_output_dir) in enumerate(zip(image_paths, page_dirs)):
+            if futures is not None:
+                page_markdown = futures[position].result()
+            else:
+                page_markdown = process_image(
+                    image_path, output_dir=page_output_dir, tokenizer=tokenizer, model=model
+                )
+            page_markdowns.append(page_markdown.strip())
+
+    combined_markdown = _write_combined_markdown(
+        output_root / f"{pdf_path_obj.stem}.md", page_markdowns
+    )
 
     return combined_markdown
 
@@ -55,6 +377,12 @@ def process_pdf_enhanced(
     save_elements: bool = True,
     start_page: Optional[int] = None,
     end_page: Optional[int] = None,
+    tokenizer=None,
+    model=None,
+    executor: Optional[Executor] = None,
+    num_workers: int = 1,
+    element_manifest: bool = False,
+    include_elements: bool = True,
 ) -> Dict:
     """
     Run OCR on each PDF page with enhanced element extraction.
@@ -70,107 +398,114 @@ def process_pdf_enhanced(
         save_elements: Whether to save individual element images
         start_page: Starting page number (1-indexed, inclusive)
         end_page: Ending page number (1-indexed, inclusive)
+        tokenizer: Preloaded tokenizer (optional, loaded on demand if None)
+        model: Preloaded model (optional, loaded on demand if None)
+        executor: Page pool from create_page_pool (optional). When given,
+            pages are processed concurrently by its workers and the
+            tokenizer/model arguments are ignored.
+        num_workers: Worker processes for a temporary page pool when no
+            executor is given (default: 1, i.e. process pages in-process)
+        element_manifest: Write each page's element metadata to one
+            manifest.jsonl instead of one JSON file per element
+            (default: False)
+        include_elements: Keep each page's element list in the returned
+            page results (default: True). Elements are always written to
+            each page's elements.json; callers that only need the document
+            structure can pass False to avoid holding them in memory.
     
     Returns:
         Dictionary with:
             - 'markdown': Combined markdown text
-            - 'pages': List of per-page results with elements
+            - 'pages': List of per-page results, each with 'elements_path'
+              and 'element_counts', plus 'elements' if include_elements
             - 'structure': Document structure JSON
             - 'output_dir': Path to output directory
     """
-    pdf_path_obj = Path(pdf_path).expanduser().resolve()
-    if not pdf_path_obj.is_file():
-        raise FileNotFoundError(f"PDF file not found: {pdf_path_obj}")
-
-    output_root = (
-        Path(output_dir).expanduser().resolve() if output_dir 
-        else pdf_path_obj.parent / f"{pdf_path_obj.stem}_outputs"
-    )
-    output_root.mkdir(parents=True, exist_ok=True)
+    pdf_path_obj, output_root = _prepare_io(pdf_path, output_dir)
 
-    # Convert PDF to images
-    image_paths = _convert_pdf_to_images(pdf_path_obj, output_root)
-    if not image_paths:
-        raise ValueError(f"No pages found in PDF: {pdf_path_obj}")
+    # Convert the selected pages to images, rendering ahead of OCR
+    num_pages, image_paths = _open_page_images(pdf_path_obj, output_root, start_page, end_page)
 
-    # Apply page range filtering
-    if start_page is not None or end_page is not None:
-        start_idx = (start_page - 1) if start_page is not None else 0
-        end_idx = end_page if end_page is not None else len(image_paths)
-        image_paths = image_paths[start_idx:end_idx]
-        
-        if not image_paths:
-            raise ValueError(f"No pages in range {start_page}-{end_page}")
-
-    # Process each page with enhanced extraction
+    # Process each page with enhanced extraction, counting element types
+    # per page and for the whole document as pages come in
     page_results = []
     page_markdowns = []
+    page_type_counts: List[Counter] = []
+    element_counts: Counter = Counter()
+    first_page = start_page if start_page else 1
+    page_dirs = _make_page_dirs(output_root, first_page, num_pages)
     
-    for index, image_path in enumerate(image_paths, start=(start_page if start_page else 1)):
-        print(f"\nProcessing page {index}/{len(image_paths)}...")
-        
-        page_output_dir = output_root / f"page_{index:04d}"
-        page_output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Enhanced processing
-        page_result = process_image_enhanced(
-            image_path=image_path,
-            output_dir=str(page_output_dir),
-            extract_options=extract_options,
-            generate_overlays=generate_overlays,
-            save_elements=save_elements,
-        )
-        
-        page_result['page_number'] = index
-        page_result['image_path'] = image_path
-        page_results.append(page_result)
-        
-        page_markdowns.append(page_result['markdown'].strip())
+    # With a page pool, every page is submitted up front and collected in page order
+    with (
+        closing(image_paths),
+        _page_executor(executor, num_workers) as pool,
+        _submit_pages(
+            pool, _process_page_enhanced, image_paths, page_dirs,
+            extract_options, generate_overlays, save_elements, element_manifest,
+        ) as (image_paths, futures),
+    ):
+        for position, (image_path, page_output_dir) in enumerate(zip(image_paths, page_dirs)):
+            index = first_page + position
+            print(f"\nProcessing page {index}/{num_pages}...")
+            
+            # Enhanced processing
+            if futures is not None:
+                page_result = futures[position].result()
+                if include_elements:
+                    page_result['elements'] = read_json(page_result['elements_path'])
+            else:
+                page_result = process_image_enhanced(
+                    image_path=image_path,
+                    output_dir=page_output_dir,
+                    extract_options=extract_options,
+                    generate_overlays=generate_overlays,
+                    save_elements=save_elements,
+                    tokenizer=tokenizer,
+                    model=model,
+                    element_manifest=element_manifest,
+                )
+                page_result = _summarize_page(
+                    page_result, page_output_dir, keep_elements=include_elements
+                )
+            
+            page_result['page_number'] = index
+            page_result['image_path'] = image_path
+            page_results.append(page_result)
+            
+            type_counts = Counter(page_result['element_counts'])
+            page_type_counts.append(type_counts)
+            element_counts.update(type_counts)
+            
+            page_markdowns.append(page_result['markdown'].strip())
 
     # Create combined markdown
-    combined_markdown = "\n\n".join(
-        f"<!-- Page {idx} -->\n{content}" if content else f"<!-- Page {idx} -->"
-        for idx, content in enumerate(page_markdowns, start=1)
+    combined_markdown = _write_combined_markdown(
+        output_root / f"{pdf_path_obj.stem}.md", page_markdowns
     )
 
-    combined_path = output_root / f"{pdf_path_obj.stem}.md"
-    combined_path.write_text(combined_markdown, encoding="utf-8")
-
     # Build document structure
-    all_elements = []
-    for page_result in page_results:
-        all_elements.extend(page_result['elements'])
-    
     document_structure = {
         'document_metadata': {
             'source_file': str(pdf_path_obj),
             'filename': pdf_path_obj.name,
             'num_pages': len(page_results),
-            'total_elements': len(all_elements),
+            'total_elements': sum(element_counts.values()),
+            'element_counts': dict(element_counts),
         },
         'pages': [
             {
                 'page': result['page_number'],
-                'num_elements': len(result['elements']),
-                'element_types': list(set(e['type'] for e in result['elements'])),
+                'num_elements': sum(type_counts.values()),
+                'element_types': list(type_counts),
+                'element_counts': dict(type_counts),
             }
-            for result in page_results
+            for result, type_counts in zip(page_results, page_type_counts)
         ],
     }
     
     # Save structure JSON
     structure_path = output_root / "document_structure.json"
-    with open(structure_path, 'w', encoding='utf-8') as f:
-        json.dump(document_structure, f, indent=2)
-    
-    # Save detailed elements per page
-    for page_result in page_results:
-        page_num = page_result['page_number']
-        page_dir = output_root / f"page_{page_num:04d}"
-        elements_json_path = page_dir / "elements.json"
-        
-        with open(elements_json_path, 'w', encoding='utf-8') as f:
-            json.dump(page_result['elements'], f, indent=2)
+    write_json(structure_path, document_structure)
     
     return {
         'markdown': combined_markdown,
@@ -185,6 +520,10 @@ def process_pdf_with_metrics(
     output_dir: Optional[str] = None,
     start_page: Optional[int] = None,
     end_page: Optional[int] = None,
+    tokenizer=None,
+    model=None,
+    executor: Optional[Executor] = None,
+    num_workers: int = 1,
 ) -> Tuple[str, AggregateMetrics]:
     """
     Run OCR on each PDF page and return result with performance metrics.
@@ -194,66 +533,89 @@ def process_pdf_with_metrics(
         output_dir: Directory for outputs (auto-generated if None)
         start_page: Starting page number (1-indexed, inclusive)
         end_page: Ending page number (1-indexed, inclusive)
+        tokenizer: Preloaded tokenizer (optional, loaded on demand if None)
+        model: Preloaded model (optional, loaded on demand if None)
+        executor: Page pool from create_page_pool (optional). When given,
+            pages are processed concurrently by its workers and the
+            tokenizer/model arguments are ignored.
+        num_workers: Worker processes for a temporary page pool when no
+            executor is given (default: 1, i.e. process pages in-process)
     
     Returns:
         Tuple of (combined_markdown, aggregate_metrics)
     """
-    pdf_path_obj = Path(pdf_path).expanduser().resolve()
-    if not pdf_path_obj.is_file():
-        raise FileNotFoundError(f"PDF file not found: {pdf_path_obj}")
+    pdf_path_obj, output_root = _prepare_io(pdf_path, output_dir)
 
-    output_root = Path(output_dir).expanduser().resolve() if output_dir else pdf_path_obj.parent / f"{pdf_path_obj.stem}_outputs"
-    output_root.mkdir(parents=True, exist_ok=True)
-
-    image_paths = _convert_pdf_to_images(pdf_path_obj, output_root)
-    if not image_paths:
-        raise ValueError(f"No pages found in PDF: {pdf_path_obj}")
-
-    # Apply page range filtering
-    if start_page is not None or end_page is not None:
-        start_idx = (start_page - 1) if start_page is not None else 0
-        end_idx = end_page if end_page is not None else len(image_paths)
-        image_paths = image_paths[start_idx:end_idx]
-        
-        if not image_paths:
-            raise ValueError(f"No pages in range {start_page}-{end_page}")
+    num_pages, image_paths = _open_page_images(pdf_path_obj, output_root, start_page, end_page)
 
     # Track metrics for each page
     tracker = PerformanceTracker()
     page_markdowns: List[str] = []
+    first_page = start_page if start_page else 1
+    page_dirs = _make_page_dirs(output_root, first_page, num_pages)
     
-    for index, image_path in enumerate(image_paths, start=(start_page if start_page else 1)):
-        page_output_dir = output_root / f"page_{index:04d}"
-        page_output_dir.mkdir(parents=True, exist_ok=True)
+    # With a page pool, every page is submitted up front and collected in page order
+    with (
+        closing(image_paths),
+        _page_executor(executor, num_workers) as pool,
+        _submit_pages(pool, _process_page_with_metrics, image_paths, page_dirs) as (image_paths, futures),
+    ):
+        for position, (image_path, page_output_dir) in enumerate(zip(image_paths, page_dirs)):
+            print(f"Processing page {first_page + position}/{num_pages}...")
+            if futures is not None:
+                page_markdown, page_metrics = futures[position].result()
+            else:
+                page_markdown, page_metrics = process_image_with_metrics(
+                    image_path, output_dir=page_output_dir, tokenizer=tokenizer, model=model
+                )
         
-        print(f"Processing page {index}/{len(image_paths)}...")
-        page_markdown, page_metrics = process_image_with_metrics(
-            image_path, output_dir=str(page_output_dir)
-        )
+            # Record metrics
+            tracker.metrics.append(page_metrics)
+            page_markdowns.append(page_markdown.strip())
         
-        # Record metrics
-        tracker.metrics.append(page_metrics)
-        page_markdowns.append(page_markdown.strip())
-        
-        # Print per-page metrics
-        print(f"  Time: {page_metrics.total_time:.2f}s | "
-              f"Tokens: {page_metrics.tokens_generated} | "
-              f"Speed: {page_metrics.tokens_per_second:.2f} tokens/sec")
+            # Print per-page metrics
+            print(f"  Time: {page_metrics.total_time:.2f}s | "
+                  f"Tokens: {page_metrics.tokens_generated} | "
+                  f"Speed: {page_metrics.tokens_per_second:.2f} tokens/sec")
 
-    combined_markdown = "\n\n".join(
-        f"<!-- Page {idx} -->\n{content}" if content else f"<!-- Page {idx} -->"
-        for idx, content in enumerate(page_markdowns, start=1)
+    combined_markdown = _write_combined_markdown(
+        output_root / f"{pdf_path_obj.stem}.md", page_markdowns
     )
-
-    combined_path = output_root / f"{pdf_path_obj.stem}.md"
-    combined_path.write_text(combined_markdown, encoding="utf-8")
     
     # Generate aggregate metrics
     aggregate_metrics = tracker.aggregate()
     
     # Save metrics to JSON
     metrics_path = output_root / "performance_metrics.json"
-    with open(metrics_path, 'w', encoding='utf-8') as f:
-        json.dump(aggregate_metrics.to_dict(), f, indent=2)
+    write_json(metrics_path, aggregate_metrics.to_dict())
 
     return combined_markdown, aggregate_metrics
+
+
+def process_pdf_parallel(
+    pdf_path: str,
+    output_dir: Optional[str] = None,
+    start_page: Optional[int] = None,
+    end_page: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    num_workers: int = 2,
+) -> Tuple[str, AggregateMetrics]:
+    """
+    Run OCR on PDF pages concurrently across worker processes.
+    
+    Same outputs as process_pdf_with_metrics. Uses the given page pool, or
+    creates a temporary one with num_workers processes (each loading its
+    own model) for the duration of the call.
+    
+    Returns:
+        Tuple of (combined_markdown, aggregate_metrics)
+    """
+    if executor is not None:
+        return process_pdf_with_metrics(
+            pdf_path, output_dir, start_page, end_page, executor=executor
+        )
+    
+    with create_page_pool(num_workers) as pool:
+        return process_pdf_with_metrics(
+            pdf_path, output_dir, start_page, end_page, executor=pool
+        )
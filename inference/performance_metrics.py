@@ -1,12 +1,11 @@
 """Performance metrics tracking for model inference."""
 
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Optional, List
-import statistics
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Track timing and throughput metrics for inference."""
     
@@ -19,7 +18,14 @@ class PerformanceMetrics:
     
     def to_dict(self):
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        return {
+            'total_time': self.total_time,
+            'tokens_generated': self.tokens_generated,
+            'tokens_per_second': self.tokens_per_second,
+            'input_tokens': self.input_tokens,
+            'total_tokens_processed': self.total_tokens_processed,
+            'peak_memory_mb': self.peak_memory_mb,
+        }
     
     def __str__(self):
         """Format metrics for display."""
@@ -37,7 +43,7 @@ class PerformanceMetrics:
         return "\n".join(lines)
 
 
-@dataclass
+@dataclass(slots=True)
 class AggregateMetrics:
     """Aggregate metrics across multiple operations."""
     
@@ -59,7 +65,19 @@ class AggregateMetrics:
     
     def to_dict(self):
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        return {
+            'num_operations': self.num_operations,
+            'total_time': self.total_time,
+            'total_tokens_generated': self.total_tokens_generated,
+            'min_time': self.min_time,
+            'max_time': self.max_time,
+            'avg_time': self.avg_time,
+            'min_tokens_per_sec': self.min_tokens_per_sec,
+            'max_tokens_per_sec': self.max_tokens_per_sec,
+            'avg_tokens_per_sec': self.avg_tokens_per_sec,
+            'total_input_tokens': self.total_input_tokens,
+            'total_tokens_processed': self.total_tokens_processed,
+        }
     
     def __str__(self):
         """Format metrics for display."""
@@ -123,21 +141,44 @@ class PerformanceTracker:
         if not self.metrics:
             raise ValueError("No metrics recorded")
         
-        times = [m.total_time for m in self.metrics]
-        throughputs = [m.tokens_per_second for m in self.metrics]
+        # Single pass over the recorded metrics
+        total_time = 0.0
+        total_tps = 0.0
+        total_tokens_generated = 0
+        total_input_tokens = 0
+        total_tokens_processed = 0
+        min_time = max_time = self.metrics[0].total_time
+        min_tps = max_tps = self.metrics[0].tokens_per_second
+        for m in self.metrics:
+            elapsed = m.total_time
+            tps = m.tokens_per_second
+            total_time += elapsed
+            total_tps += tps
+            total_tokens_generated += m.tokens_generated
+            total_input_tokens += m.input_tokens
+            total_tokens_processed += m.total_tokens_processed
+            if elapsed < min_time:
+                min_time = elapsed
+            elif elapsed > max_time:
+                max_time = elapsed
+            if tps < min_tps:
+                min_tps = tps
+            elif tps > max_tps:
+                max_tps = tps
         
+        n = len(self.metrics)
         return AggregateMetrics(
-            num_operations=len(self.metrics),
-            total_time=sum(times),
-            total_tokens_generated=sum(m.tokens_generated for m in self.metrics),
-            min_time=min(times),
-            max_time=max(times),
-            avg_time=statistics.mean(times),
-            min_tokens_per_sec=min(throughputs),
-            max_tokens_per_sec=max(throughputs),
-            avg_tokens_per_sec=statistics.mean(throughputs),
-            total_input_tokens=sum(m.input_tokens for m in self.metrics),
-            total_tokens_processed=sum(m.total_tokens_processed for m in self.metrics),
+            num_operations=n,
+            total_time=total_time,
+            total_tokens_generated=total_tokens_generated,
+            min_time=min_time,
+            max_time=max_time,
+            avg_time=total_time / n,
+            min_tokens_per_sec=min_tps,
+            max_tokens_per_sec=max_tps,
+            avg_tokens_per_sec=total_tps / n,
+            total_input_tokens=total_input_tokens,
+            total_tokens_processed=total_tokens_processed,
         )
 
 
@@ -149,3 +190,19 @@ def count_tokens(text: str, tokenizer) -> int:
     except Exception:
         # Fallback: rough estimate (1 token ≈ 4 characters)
         return max(1, len(text) // 4)
+
+
+def count_tokens_batch(texts: List[str], tokenizer) -> List[int]:
+    """
+    Count tokens in several texts with one batched tokenizer call.
+    
+    Falls back to count_tokens per text if the tokenizer cannot batch
+    (e.g. a slow tokenizer without return_length support).
+    """
+    if tokenizer is None:
+        return [max(1, len(text) // 4) for text in texts]
+    try:
+        encoded = tokenizer(texts, add_special_tokens=True, return_length=True, padding=False)
+        return [int(length) for length in encoded["length"]]
+    except Exception:
+        return [count_tokens(text, tokenizer) for text in texts]
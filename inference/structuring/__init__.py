@@ -8,12 +8,18 @@ and relationship building.
 
 __version__ = "0.1.0"
 
-from .json_builder import build_document_json
-from .element_classifier import enrich_element
-from .hierarchy_analyzer import build_document_hierarchy
+from .._lazy import lazy_exports
+
+# Submodules are imported on first access to one of their names
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "build_document_json": "json_builder",
+    "enrich_element": "element_classifier",
+    "build_document_hierarchy": "hierarchy_analyzer",
+})
 
 __all__ = [
     "build_document_json",
     "enrich_element",
     "build_document_hierarchy",
 ]
+
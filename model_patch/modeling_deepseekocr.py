@@ -700,7 +700,7 @@ class DeepseekOCRForCausalLM(DeepseekV2ForCausalLM):
 
 
 
-    def infer(self, tokenizer, prompt='', image_file='', output_path = '', base_size=1024, image_size=640, crop_mode=True, test_compress=False, save_results=False, eval_mode=False):
+    def infer(self, tokenizer, prompt='', image_file='', output_path = '', base_size=1024, image_size=640, crop_mode=True, test_compress=False, save_results=False, eval_mode=False, return_raw=False):
         self.disable_torch_init()
 
         os.makedirs(output_path, exist_ok=True)
@@ -986,6 +986,7 @@ class DeepseekOCRForCausalLM(DeepseekV2ForCausalLM):
             result = process_image_with_refs(image_draw, matches_ref, output_path)
 
             # Save raw output with grounding references for enhanced extraction
+            raw_outputs = outputs
             with open(f'{output_path}/result_raw.txt', 'w', encoding='utf-8') as afile:
                 afile.write(outputs)
 
@@ -1042,5 +1043,8 @@ class DeepseekOCRForCausalLM(DeepseekV2ForCausalLM):
 
             result.save(f"{output_path}/result_with_boxes.jpg")
             
-            # Return the processed markdown output
+            # Return the processed markdown output, plus the raw output with
+            # grounding references when requested
+            if return_raw:
+                return outputs, raw_outputs
             return outputs
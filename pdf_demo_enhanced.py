@@ -138,20 +138,16 @@ def main():
         print("Example Queries")
         print("="*70)
         
-        # Count elements by type
+        # Element counts by type are computed during processing
         from collections import Counter
-        all_elements = []
-        for page in result['pages']:
-            all_elements.extend(page['elements'])
-        
-        type_counts = Counter(e['type'] for e in all_elements)
+        type_counts = Counter(result['structure']['document_metadata']['element_counts'])
         
         print("\nElement types in document:")
         for element_type, count in type_counts.most_common():
             print(f"  {element_type:20s}: {count:4d}")
         
         # Find images
-        images = [e for e in all_elements if e['type'] == 'image']
+        images = [e for page in result['pages'] for e in page['elements'] if e['type'] == 'image']
         print(f"\nFound {len(images)} images in document")
         if images:
             print("First image:")
@@ -162,8 +158,7 @@ def main():
             print(f"  Size: {img['metrics']['width']:.0f} x {img['metrics']['height']:.0f} pixels")
         
         # Find titles
-        titles = [e for e in all_elements if e['type'] == 'title']
-        print(f"\nFound {len(titles)} titles in document")
+        print(f"\nFound {type_counts['title']} titles in document")
         
         print("\n✓ Enhanced processing completed successfully!")
         print(f"\nExplore the outputs in: {output_dir}")
@@ -0,0 +1,40 @@
+"""Tests for the batched bounding box helpers."""
+
+import numpy as np
+import pytest
+
+from inference.extraction import bbox_processor
+
+
+def _random_boxes(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Integer-valued boxes, including zero-area, inverted and identical ones."""
+    xy = rng.integers(0, 1000, size=(n, 2))
+    wh = rng.integers(-5, 300, size=(n, 2))
+    boxes = np.hstack([xy, xy + wh]).astype(np.float64)
+    boxes[n // 2] = boxes[0]
+    return boxes
+
+
+def test_batch_check_overlap_matches_batch_iou():
+    boxes = _random_boxes(np.random.default_rng(0), 200)
+    
+    iou = bbox_processor.batch_check_overlap(boxes)
+    
+    assert iou.dtype == np.float64
+    np.testing.assert_array_equal(iou, bbox_processor.batch_iou(boxes, boxes))
+
+
+def test_numba_and_numpy_iou_are_identical():
+    pytest.importorskip("numba")
+    from inference.extraction._iou_numba import pairwise_iou
+    
+    rng = np.random.default_rng(1)
+    for n in (0, 1, 7, 150):
+        boxes = _random_boxes(rng, n) if n else np.zeros((0, 4))
+        # Non-integer coordinates exercise rounding as well
+        boxes = boxes + rng.random(boxes.shape)
+        
+        compiled = pairwise_iou(np.ascontiguousarray(boxes))
+        
+        assert compiled.dtype == np.float64
+        np.testing.assert_array_equal(compiled, bbox_processor.batch_iou(boxes, boxes))